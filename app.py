@@ -4,13 +4,18 @@ Loan Prediction Web Application
 Flask API Backend for serving ML model predictions
 """
 
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template
 from flask_cors import CORS
 import pickle
 import numpy as np
 import logging
 import os
+import time
 from src.loan_predictor.loan_predictor import LoanPredictor
+from src.loan_predictor.cache import PredictionCache, make_key
+from src.loan_predictor.metrics import CONTENT_TYPE, MetricsRegistry, StageTimer
+from src.loan_predictor.reloading import ModelReloader
+from src.loan_predictor.schema import APPLICANT_SCHEMA, compile_schema, format_errors
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,20 +25,145 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 CORS(app)  # Enable cross-origin requests
 
+# Saved model: a .pkl bundle or a directory written by save_model(..., mmap=True)
+MODEL_PATH = os.environ.get('MODEL_PATH', 'loan_predictor_model.pkl')
+
+# Repeated applicant payloads are answered from this cache (size 0 disables it)
+prediction_cache = PredictionCache(
+    maxsize=int(os.environ.get('PREDICTION_CACHE_SIZE', 1024)),
+    ttl=float(os.environ.get('PREDICTION_CACHE_TTL', 300))
+)
+
+# Reload the model when MODEL_PATH changes on disk, polling every N seconds (0 disables)
+MODEL_WATCH_INTERVAL = float(os.environ.get('MODEL_WATCH_INTERVAL', 0))
+
+# Shared secret for POST /api/admin/reload; the endpoint is disabled when unset
+RELOAD_TOKEN = os.environ.get('RELOAD_TOKEN')
+
+# Opt-in sampling profiler: collapsed stacks of the first PROFILE_REQUESTS predictions
+PROFILE_REQUESTS = int(os.environ.get('PROFILE_REQUESTS', 0))
+PROFILE_OUTPUT = os.environ.get('PROFILE_OUTPUT', 'loan_predictor.folded')
+
+# Prometheus metrics served at /metrics (per worker process)
+metrics = MetricsRegistry()
+REQUESTS = metrics.counter('loan_requests_total', 'HTTP requests handled', ['endpoint', 'method', 'status'])
+REQUEST_ERRORS = metrics.counter('loan_request_errors_total', 'HTTP requests answered with a 4xx or 5xx status',
+                                 ['endpoint', 'status'])
+REQUEST_SECONDS = metrics.histogram('loan_request_duration_seconds', 'End-to-end request latency', ['endpoint'])
+STAGE_SECONDS = metrics.histogram('loan_stage_duration_seconds',
+                                  'Latency of each request-handling and prediction stage', ['stage'])
+
+def observe_stage(stage, seconds):
+    """Record one stage duration; also installed as the predictor's stage_observer"""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+def record_request(endpoint, method, status, seconds):
+    """Count a finished request and record its latency"""
+    REQUESTS.inc(endpoint=endpoint, method=method, status=status)
+    if status >= 400:
+        REQUEST_ERRORS.inc(endpoint=endpoint, status=status)
+    REQUEST_SECONDS.observe(seconds, endpoint=endpoint)
+
+def load_predictor(path):
+    """Load and compile a model bundle"""
+    new_predictor = LoanPredictor()
+    new_predictor.stage_observer = observe_stage
+    # Memory-map numeric arrays so forked workers share pages
+    new_predictor.load_model(path, mmap_mode='r')
+    new_predictor.compile_inference()
+    return new_predictor
+
+def install_predictor(new_predictor):
+    """Swap in a loaded predictor and invalidate predictions made by the previous one"""
+    global predictor
+    # A single reference assignment: requests use either the old or the new model
+    predictor = new_predictor
+    prediction_cache.clear()
+
 # Load the trained model
 try:
-    predictor = LoanPredictor()
-    predictor.load_model('loan_predictor_model.pkl')
+    predictor = load_predictor(MODEL_PATH)
     logger.info("Model loaded successfully")
+    if PROFILE_REQUESTS > 0:
+        predictor.profile_requests(f"{PROFILE_OUTPUT}.{os.getpid()}", PROFILE_REQUESTS)
+        logger.info(f"Sampling the next {PROFILE_REQUESTS} predictions into {PROFILE_OUTPUT}.{os.getpid()}")
 except Exception as e:
     logger.error(f"Error loading model: {e}")
     predictor = None
 
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    record_request(endpoint, request.method, response.status_code, time.perf_counter() - g.request_start)
+    return response
+
 @app.route('/')
 def home():
     """Serve the main web application page"""
     return render_template('index.html')
 
+# Validates and converts request payloads in one pass; shared with asgi.py
+APPLICANT_VALIDATOR = compile_schema(APPLICANT_SCHEMA)
+REQUIRED_FIELDS = APPLICANT_VALIDATOR.required
+
+# Upper bound on applicants accepted by a single batch request
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 10000))
+
+def invalid_applicant(errors):
+    """Response body for a payload rejected by the schema"""
+    return {'error': format_errors(errors), 'errors': errors, 'success': False}
+
+# Applicants (in request format) every reloaded model must score before it is swapped in
+SMOKE_APPLICANTS = [
+    {'gender': 'Male', 'married': 'Yes', 'dependents': '1', 'education': 'Graduate',
+     'self_employed': 'No', 'applicant_income': 60000, 'coapplicant_income': 0,
+     'loan_amount': 128000, 'loan_amount_term': 360, 'credit_history': '1.0',
+     'property_area': 'Urban'},
+    {'gender': 'Female', 'married': 'No', 'dependents': '0', 'education': 'Not Graduate',
+     'self_employed': 'Yes', 'applicant_income': 30000, 'coapplicant_income': 12000,
+     'loan_amount': 250000, 'loan_amount_term': 180, 'credit_history': '0.0',
+     'property_area': 'Rural'}
+]
+
+def validate_predictor(candidate):
+    """Score the smoke batch with a freshly loaded predictor; raise ValueError if it misbehaves
+    
+    This also performs any deferred estimator load and warms the compiled
+    paths, so the first real request after the swap is not slowed down.
+    """
+    # Compiled tree models score the smoke batch without touching the estimator, so load it here
+    candidate.best_model
+    applicants = [APPLICANT_VALIDATOR.convert(item)[0] for item in SMOKE_APPLICANTS]
+    results = candidate.predict_batch(applicants)
+    if len(results) != len(applicants):
+        raise ValueError(f"Smoke batch returned {len(results)} results for {len(applicants)} applicants")
+    for applicant, batch_probability in zip(applicants, results['probability']):
+        single = candidate.predict_loan(applicant)
+        if not 0.0 <= single['probability'] <= 1.0:
+            raise ValueError(f"Probability out of range: {single['probability']}")
+        if abs(single['probability'] - batch_probability) > 1e-6:
+            raise ValueError("Single and batch predictions disagree on the smoke batch")
+
+reloader = ModelReloader(load_predictor, validate_predictor, install_predictor)
+if MODEL_WATCH_INTERVAL > 0:
+    reloader.watch(MODEL_PATH, MODEL_WATCH_INTERVAL)
+
+def format_prediction(approved, probability, display_data):
+    """Build the response body for one scored applicant"""
+    prediction = 'Y' if approved else 'N'
+    return {
+        'success': True,
+        'prediction': prediction,
+        'probability': round(probability * 100, 2),
+        'status': 'approved' if prediction == 'Y' else 'rejected',
+        'confidence': 'high' if probability > 0.7 or probability < 0.3 else 'moderate',
+        'applicant_data': display_data
+    }
+
 @app.route('/api/predict', methods=['POST'])
 def predict():
     """
@@ -55,81 +185,112 @@ def predict():
     }
     """
     try:
-        if not predictor:
+        # Read the cache generation before the model, so a result from a model
+        # that is swapped out meanwhile is never cached for its replacement
+        generation = prediction_cache.generation
+        current = predictor
+        if not current:
             return jsonify({
                 'error': 'Model not loaded',
                 'success': False
             }), 500
 
         # Get data from request
-        data = request.json
-        logger.info(f"Received prediction request: {data}")
-
-        # Validate required fields
-        required_fields = [
-            'gender', 'married', 'dependents', 'education', 'self_employed',
-            'applicant_income', 'coapplicant_income', 'loan_amount', 
-            'loan_amount_term', 'credit_history', 'property_area'
-        ]
-        
-        missing_fields = [field for field in required_fields if field not in data]
-        if missing_fields:
+        with StageTimer(observe_stage, 'json_parse'):
+            data = request.json
+        logger.debug(f"Received prediction request: {data}")
+
+        # Validate and convert to model units (and display values) in one pass
+        with StageTimer(observe_stage, 'validation'):
+            applicant_data, display_data, errors = APPLICANT_VALIDATOR.convert(data)
+        if errors:
+            return jsonify(invalid_applicant(errors)), 400
+
+        # Make prediction using the existing method, reusing cached results
+        cache_key = make_key(applicant_data)
+        result = prediction_cache.get(cache_key)
+        if result is None:
+            result = current.predict_loan(applicant_data)
+            prediction_cache.put(cache_key, result, generation)
+
+        # Format response with original user input values for display
+        with StageTimer(observe_stage, 'serialization'):
+            response = format_prediction(result['approved'], result['probability'], display_data)
+            body = jsonify(response)
+
+        logger.debug(f"Prediction result: {response}")
+        return body
+
+    except Exception as e:
+        logger.error(f"Prediction error: {e}")
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    API endpoint for scoring many applicants in one request
+    
+    Expects a JSON array of objects in the /api/predict format and
+    returns one result per applicant, in the same order.
+    """
+    try:
+        # One model for the whole batch even if a reload swaps it meanwhile
+        current = predictor
+        if not current:
+            return jsonify({
+                'error': 'Model not loaded',
+                'success': False
+            }), 500
+
+        with StageTimer(observe_stage, 'json_parse'):
+            data = request.json
+        if not isinstance(data, list):
+            return jsonify({
+                'error': 'Expected a JSON array of applicants',
+                'success': False
+            }), 400
+        if len(data) > MAX_BATCH_SIZE:
+            return jsonify({
+                'error': f'Batch too large: {len(data)} applicants (max {MAX_BATCH_SIZE})',
+                'success': False
+            }), 400
+        logger.info(f"Received batch prediction request with {len(data)} applicants")
+
+        # Validate and convert every applicant before scoring any
+        applicants, displays, errors = [], [], {}
+        with StageTimer(observe_stage, 'validation'):
+            for i, item in enumerate(data):
+                applicant_data, display_data, item_errors = APPLICANT_VALIDATOR.convert(item)
+                if item_errors:
+                    errors[i] = format_errors(item_errors)
+                applicants.append(applicant_data)
+                displays.append(display_data)
+        if errors:
             return jsonify({
-                'error': f'Missing required fields: {missing_fields}',
+                'error': 'Invalid applicants in batch',
+                'errors': errors,
                 'success': False
             }), 400
 
-        # Create applicant data dictionary
-        # Convert annual income to monthly for model compatibility
-        # Convert loan amount from full dollars to thousands for model
-        applicant_data = {
-            'Gender': data['gender'],
-            'Married': data['married'],
-            'Dependents': data['dependents'],
-            'Education': data['education'],
-            'Self_Employed': data['self_employed'],
-            'ApplicantIncome': float(data['applicant_income']) / 12,  # Convert annual to monthly
-            'CoapplicantIncome': float(data['coapplicant_income']) / 12,  # Convert annual to monthly
-            'LoanAmount': float(data['loan_amount']) / 1000,  # Convert to thousands for model
-            'Loan_Amount_Term': float(data['loan_amount_term']),
-            'Credit_History': float(data['credit_history']),
-            'Property_Area': data['property_area']
-        }
-
-        # Make prediction using the existing method
-        result = predictor.predict_loan(applicant_data)
-        prediction = 'Y' if result['approved'] else 'N'
-        probability = result['probability']
+        results = current.predict_batch(applicants)
 
-        # Format response with original user input values for display
-        display_data = {
-            'Gender': data['gender'],
-            'Married': data['married'],
-            'Dependents': data['dependents'],
-            'Education': data['education'],
-            'Self_Employed': data['self_employed'],
-            'ApplicantIncome': float(data['applicant_income']),  # Keep original annual income
-            'CoapplicantIncome': float(data['coapplicant_income']),  # Keep original annual income
-            'LoanAmount': float(data['loan_amount']),  # Keep original full dollar amount
-            'Loan_Amount_Term': float(data['loan_amount_term']),
-            'Credit_History': float(data['credit_history']),
-            'Property_Area': data['property_area']
-        }
-        
-        response = {
-            'success': True,
-            'prediction': prediction,
-            'probability': round(probability * 100, 2),
-            'status': 'approved' if prediction == 'Y' else 'rejected',
-            'confidence': 'high' if probability > 0.7 or probability < 0.3 else 'moderate',
-            'applicant_data': display_data
-        }
-
-        logger.info(f"Prediction result: {response}")
-        return jsonify(response)
+        with StageTimer(observe_stage, 'serialization'):
+            predictions = [
+                format_prediction(approved, probability, display_data)
+                for display_data, approved, probability in zip(displays, results['approved'], results['probability'])
+            ]
+            return jsonify({
+                'success': True,
+                'count': len(predictions),
+                'model_used': current.best_model_name,
+                'predictions': predictions
+            })
 
     except Exception as e:
-        logger.error(f"Prediction error: {e}")
+        logger.error(f"Batch prediction error: {e}")
         return jsonify({
             'error': str(e),
             'success': False
@@ -141,9 +302,34 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'model_loaded': predictor is not None,
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'prediction_cache': prediction_cache.stats(),
+        'model_reload': reloader.status()
     })
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Request counts, error counts and per-stage latency histograms in Prometheus format"""
+    return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+@app.route('/api/admin/reload', methods=['POST'])
+def reload_model():
+    """
+    Reload MODEL_PATH in the background and swap it in once it passes the smoke batch
+    
+    Requires the X-Reload-Token header to match RELOAD_TOKEN. Only the
+    worker process that serves this request reloads; use
+    MODEL_WATCH_INTERVAL to have every worker follow the file.
+    """
+    if not RELOAD_TOKEN:
+        return jsonify({'error': 'Model reload is disabled', 'success': False}), 403
+    if request.headers.get('X-Reload-Token') != RELOAD_TOKEN:
+        return jsonify({'error': 'Invalid reload token', 'success': False}), 403
+
+    started = reloader.reload_in_background(MODEL_PATH)
+    logger.info(f"Model reload {'started' if started else 'already in progress'} for {MODEL_PATH}")
+    return jsonify({'success': True, 'started': started, 'model_reload': reloader.status()}), 202
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
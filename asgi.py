@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Loan Prediction ASGI Application
+Async alternative to app:app that micro-batches concurrent /api/predict calls
+
+Concurrent requests are queued for up to MICROBATCH_MAX_WAIT_MS milliseconds
+(or until MICROBATCH_MAX_SIZE are waiting) and scored with one vectorized
+predict_batch call. Request/response formats and /metrics match the
+Flask app.
+
+Run with an ASGI server, e.g.:
+    pip install uvicorn
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+
+import json
+import logging
+import os
+import time
+
+import app as web_app
+from src.loan_predictor.batching import MicroBatcher
+from src.loan_predictor.cache import make_key
+from src.loan_predictor.metrics import CONTENT_TYPE, StageTimer
+
+logger = logging.getLogger(__name__)
+
+MICROBATCH_MAX_SIZE = int(os.environ.get('MICROBATCH_MAX_SIZE', 64))
+MICROBATCH_MAX_WAIT_MS = float(os.environ.get('MICROBATCH_MAX_WAIT_MS', 5))
+
+def score_applicants(applicants):
+    """Score a micro-batch of applicant dicts with one predict_batch call"""
+    predictor = web_app.predictor
+    results = predictor.predict_batch(applicants)
+    return [
+        {'approved': bool(approved), 'probability': float(probability), 'model_used': predictor.best_model_name}
+        for approved, probability in zip(results['approved'], results['probability'])
+    ]
+
+batcher = MicroBatcher(score_applicants, max_batch_size=MICROBATCH_MAX_SIZE, max_wait_ms=MICROBATCH_MAX_WAIT_MS)
+
+async def read_body(receive):
+    """Read the full request body from the ASGI receive channel"""
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        more_body = message.get('more_body', False)
+    return b''.join(chunks)
+
+async def send_body(send, body, status=200, content_type=b'application/json'):
+    """Send an already encoded response body"""
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', content_type), (b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def send_json(send, payload, status=200):
+    """Send a JSON response"""
+    await send_body(send, json.dumps(payload).encode('utf-8'), status)
+
+async def predict(receive, send):
+    """Micro-batched equivalent of app.predict()"""
+    if not web_app.predictor:
+        return await send_json(send, {'error': 'Model not loaded', 'success': False}, 500)
+
+    body = await read_body(receive)
+    try:
+        with StageTimer(web_app.observe_stage, 'json_parse'):
+            data = json.loads(body)
+    except ValueError:
+        return await send_json(send, {'error': 'Invalid JSON body', 'success': False}, 400)
+
+    with StageTimer(web_app.observe_stage, 'validation'):
+        applicant_data, display_data, errors = web_app.APPLICANT_VALIDATOR.convert(data)
+    if errors:
+        return await send_json(send, web_app.invalid_applicant(errors), 400)
+
+    try:
+        cache_key = make_key(applicant_data)
+        result = web_app.prediction_cache.get(cache_key)
+        if result is None:
+            # The batch may be scored by a model swapped in later; see app.predict()
+            generation = web_app.prediction_cache.generation
+            result = await batcher.submit(applicant_data)
+            web_app.prediction_cache.put(cache_key, result, generation)
+        with StageTimer(web_app.observe_stage, 'serialization'):
+            response = web_app.format_prediction(result['approved'], result['probability'], display_data)
+            body = json.dumps(response).encode('utf-8')
+    except Exception as e:
+        logger.error(f"Prediction error: {e}")
+        return await send_json(send, {'error': str(e), 'success': False}, 500)
+
+    await send_body(send, body)
+
+async def lifespan(receive, send):
+    """Handle ASGI startup/shutdown events"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await batcher.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+ROUTES = {('/api/predict', 'POST'), ('/api/health', 'GET'), ('/metrics', 'GET')}
+
+async def app(scope, receive, send):
+    """ASGI entry point; records the same request metrics as the Flask app"""
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+
+    path, method = scope['path'], scope['method']
+    endpoint = path if (path, method) in ROUTES else 'unmatched'
+    start = time.perf_counter()
+    status = 500
+
+    async def send_and_record_status(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        await send(message)
+
+    try:
+        await route(path, method, receive, send_and_record_status)
+    finally:
+        web_app.record_request(endpoint, method, status, time.perf_counter() - start)
+
+async def route(path, method, receive, send):
+    """Dispatch one HTTP request"""
+    if path == '/api/predict' and method == 'POST':
+        return await predict(receive, send)
+    if path == '/metrics' and method == 'GET':
+        return await send_body(send, web_app.metrics.render().encode('utf-8'),
+                               content_type=CONTENT_TYPE.encode())
+    if path == '/api/health' and method == 'GET':
+        return await send_json(send, {
+            'status': 'healthy',
+            'model_loaded': web_app.predictor is not None,
+            'version': '1.0.0',
+            'model_reload': web_app.reloader.status(),
+            'microbatching': {
+                'max_batch_size': batcher.max_batch_size,
+                'max_wait_ms': MICROBATCH_MAX_WAIT_MS,
+                'batches_scored': batcher.batches_scored,
+                'items_scored': batcher.items_scored
+            }
+        })
+    await send_json(send, {'error': 'Endpoint not found'}, 404)
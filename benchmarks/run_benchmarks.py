@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark suite for the training and inference hot paths
+
+Times create_sample_data (and the chunked generator), preprocess_data,
+encode_features, the fused transform, each model fit in train_models,
+predict_loan single-row latency (p50/p99), predict_batch
+throughput and load_model cold start, and writes the results as JSON.
+Memory use of the encoded training frame is reported with and without
+compact mode, and python -X importtime totals for importing the package,
+its modules and the web app (which includes loading the model).
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000,10000,100000,1000000 --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 1000 --compare bench.json
+
+Keys ending in _s or _ms are durations and keys ending in _bytes are
+memory sizes (lower is better); keys ending in _per_sec are throughputs (higher is better). --compare exits with status 1
+when any of them regressed by more than --tolerance.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.data_generation import generate_sample_chunks
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the predictor's progress prints"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def timed(fn, *args, **kwargs):
+    """Run fn once and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def latency_percentiles(fn, applicants, repeat):
+    """Call fn once per applicant (cycling) and return p50/p99/mean latency in ms"""
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn(applicants[i % len(applicants)])
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'p50_ms': float(np.percentile(timings, 50)),
+        'p99_ms': float(np.percentile(timings, 99)),
+        'mean_ms': float(np.mean(timings)),
+        'calls': repeat
+    }
+
+
+def frame_bytes(df):
+    """Deep memory usage of a DataFrame, including string contents"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def bench_memory(df):
+    """Time compact preprocessing and compare encoded-frame memory with the default mode"""
+    default, compact = LoanPredictor(), LoanPredictor(compact=True)
+    result = {}
+    processed, result['preprocess_data_s'] = timed(compact.preprocess_data, df)
+    encoded, result['encode_features_s'] = timed(compact.encode_features, processed, fit=True)
+
+    result['raw_bytes'] = frame_bytes(df)
+    result['default_bytes'] = frame_bytes(default.encode_features(default.preprocess_data(df), fit=True))
+    result['compact_bytes'] = frame_bytes(encoded)
+    result['compact_saving'] = 1 - result['compact_bytes'] / result['default_bytes']
+    return result
+
+
+def bench_size(n_samples, max_train_rows, n_jobs):
+    """Benchmark the data and training pipeline at one dataset size"""
+    predictor = LoanPredictor()
+    result = {}
+
+    df, result['create_sample_data_s'] = timed(predictor.create_sample_data, n_samples)
+    _, result['generate_sample_chunks_s'] = timed(
+        lambda: sum(len(chunk) for chunk in generate_sample_chunks(n_samples, chunk_size=100000))
+    )
+    processed, result['preprocess_data_s'] = timed(predictor.preprocess_data, df)
+    _, result['encode_features_s'] = timed(predictor.encode_features, processed, fit=True)
+    del processed
+    _, result['transform_s'] = timed(predictor.transform, df)
+    result['compact'] = bench_memory(df)
+
+    if n_samples <= max_train_rows:
+        with quiet():
+            _, total = timed(predictor.train_models, df, n_jobs=n_jobs)
+        result['train_models'] = {
+            'total_s': total,
+            'fit': {f'{name}_s': seconds for name, seconds in predictor.fit_times.items()},
+            'best_model': predictor.best_model[0]
+        }
+    else:
+        result['train_models'] = {'skipped': f'more than --max-train-rows={max_train_rows} rows'}
+
+    return result, df, predictor
+
+
+def bench_batch(predictor, df):
+    """Time predict_batch over a whole frame"""
+    applicants = df.drop(['Loan_Status'], axis=1)
+    _, seconds = timed(predictor.predict_batch, applicants)
+    return {'total_s': seconds, 'rows': len(applicants), 'rows_per_sec': len(applicants) / seconds}
+
+
+def bench_cold_start(path, repeat=3):
+    """Time a fresh interpreter importing the package and loading the model"""
+    code = (
+        "import sys, time; start = time.perf_counter(); "
+        f"sys.path.insert(0, {os.path.join(ROOT, 'src')!r}); "
+        "from loan_predictor.loan_predictor import LoanPredictor; "
+        f"p = LoanPredictor(); p.load_model({path!r}); "
+        "sys.stderr.write(repr(time.perf_counter() - start))"
+    )
+    timings = []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        timings.append(float(completed.stderr.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def _importtime_totals(stderr):
+    """{top-level module: cumulative seconds} from python -X importtime output"""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        # 'import time: <self us> | <cumulative us> | <module>', nested modules indented
+        _, cumulative_us, name = line.split('|')
+        if cumulative_us.strip().isdigit() and not name[1:].startswith(' '):
+            totals[name.strip()] = int(cumulative_us) / 1e6
+    return totals
+
+
+def import_time(statement, repeat=3, cwd=None):
+    """Best-of-repeat seconds python -X importtime attributes to statement in a fresh interpreter
+
+    Modules the bare interpreter imports at startup are not counted.
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, 'src'))
+    command = [sys.executable, '-X', 'importtime', '-c']
+    startup = _importtime_totals(subprocess.run(command + ['pass'], capture_output=True, text=True,
+                                                check=True, env=env).stderr)
+    timings = []
+    for _ in range(repeat):
+        completed = subprocess.run(command + [statement], capture_output=True, text=True, check=True,
+                                   env=env, cwd=cwd)
+        totals = _importtime_totals(completed.stderr)
+        timings.append(sum(seconds for name, seconds in totals.items() if name not in startup))
+    return min(timings)
+
+
+def bench_import_time(repeat=3):
+    """Import cost of the lazy package, the predictor module, the NumPy-only runtime and the web app"""
+    return {
+        'package_s': import_time('import loan_predictor', repeat),
+        'loan_predictor_module_s': import_time('import loan_predictor.loan_predictor', repeat),
+        'portable_runtime_s': import_time('import loan_predictor.portable', repeat),
+        # app loads and compiles loan_predictor_model.pkl at import time
+        'app_cold_start_s': import_time('import app', repeat, cwd=ROOT)
+    }
+
+
+def bench_inference(predictor, df, repeat):
+    """Benchmark single-row latency and model loading for a trained predictor"""
+    applicants = df.drop(['Loan_Status'], axis=1).head(100).to_dict('records')
+    result = {'model': predictor.best_model[0]}
+
+    predictor.compiled_inference = None
+    predictor.compiled_trees = None
+    result['predict_loan_dataframe'] = latency_percentiles(predictor.predict_loan, applicants, repeat)
+    predictor.compile_inference()
+    result['predict_loan_compiled'] = latency_percentiles(predictor.predict_loan, applicants, repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = os.path.join(tmp, 'model.pkl')
+        directory_path = os.path.join(tmp, 'model')
+        with quiet():
+            predictor.save_model(pickle_path)
+            predictor.save_model(directory_path, mmap=True)
+            _, result['load_model_pickle_s'] = timed(LoanPredictor().load_model, pickle_path)
+            _, result['load_model_directory_s'] = timed(LoanPredictor().load_model, directory_path)
+        result['cold_start_pickle_s'] = bench_cold_start(pickle_path)
+        result['cold_start_directory_s'] = bench_cold_start(directory_path)
+
+    return result
+
+
+def run(sizes, max_train_rows, n_jobs, repeat):
+    """Run the whole suite and return the JSON-serializable report"""
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'sklearn': sklearn.__version__
+        },
+        'sizes': {}
+    }
+
+    trained = None
+    for n_samples in sizes:
+        print(f"Benchmarking {n_samples} rows...", file=sys.stderr)
+        result, df, predictor = bench_size(n_samples, max_train_rows, n_jobs)
+        if trained is None and 'total_s' in result['train_models']:
+            # Inference is measured on the model trained at the first trainable size
+            trained = predictor
+        if trained is not None:
+            result['predict_batch'] = bench_batch(trained, df)
+        report['sizes'][str(n_samples)] = result
+
+    if trained is not None:
+        print("Benchmarking inference...", file=sys.stderr)
+        report['inference'] = bench_inference(trained, df, repeat)
+
+    print("Benchmarking import time...", file=sys.stderr)
+    report['import_time'] = bench_import_time()
+    return report
+
+
+def flatten(report, prefix=''):
+    """Flatten nested dicts into {'a.b.c': number}"""
+    values = {}
+    for key, value in report.items():
+        path = f'{prefix}{key}'
+        if isinstance(value, dict):
+            values.update(flatten(value, path + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[path] = value
+    return values
+
+
+def compare(baseline, current, tolerance):
+    """Return human-readable regressions of current against baseline"""
+    old, new = flatten(baseline), flatten(current)
+    regressions = []
+    for key in sorted(set(old) & set(new)):
+        if key.startswith('meta.') or old[key] <= 0:
+            continue
+        if key.endswith(('_s', '_ms', '_bytes')):
+            change = new[key] / old[key] - 1
+        elif key.endswith('_per_sec'):
+            change = old[key] / new[key] - 1 if new[key] > 0 else float('inf')
+        else:
+            continue
+        if change > tolerance:
+            regressions.append(f'{key}: {old[key]:.6g} -> {new[key]:.6g} ({change:+.0%} worse)')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help='comma-separated dataset sizes (default: %(default)s)')
+    parser.add_argument('--max-train-rows', type=int, default=100000,
+                        help='skip train_models above this many rows (default: %(default)s)')
+    parser.add_argument('--n-jobs', type=int, default=None, help='n_jobs passed to train_models')
+    parser.add_argument('--repeat', type=int, default=1000, help='predict_loan calls per latency measurement')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', help='baseline JSON report to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed relative slowdown before a metric counts as a regression')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    report = run(sizes, args.max_train_rows, args.n_jobs, args.repeat)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+
+"""
+Main entry point for scoring a file of loan applications in bulk
+"""
+
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from loan_predictor.scoring import main
+
+if __name__ == "__main__":
+    main()
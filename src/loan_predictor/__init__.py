@@ -2,11 +2,30 @@
 Loan Prediction System
 
 A machine learning application for predicting loan approval decisions.
+
+Submodules are imported on first use, so importing the package (or a
+NumPy-only module such as loan_predictor.portable) does not load pandas
+and scikit-learn.
 """
 
-from .loan_predictor import LoanPredictor
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Loan Prediction Team"
 
-__all__ = ["LoanPredictor"]
\ No newline at end of file
+__all__ = ["LoanPredictor"]
+
+# Public name -> submodule defining it
+_LAZY_ATTRIBUTES = {"LoanPredictor": "loan_predictor"}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
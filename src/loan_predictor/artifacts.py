@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+"""
+Directory model format
+
+save_model(..., mmap=True) writes a bundle directory holding a JSON
+manifest and one version-<ns> subdirectory per save with the preprocessing
+state, the estimator and, for tree models, the compiled node arrays. The
+manifest names the current version's files, so it is all a reader needs to
+find them. This module only holds the layout, so code that watches bundles
+does not have to import the predictor and scikit-learn.
+"""
+
+import json
+import os
+
+MANIFEST_FILE = 'manifest.json'
+PREPROCESSING_FILE = 'preprocessing.joblib'
+MODEL_FILE = 'model.joblib'
+TREES_DIRECTORY = 'trees'
+ARTIFACT_FORMAT_VERSION = 1
+# Each save writes its files into a new version-<ns> subdirectory of the bundle
+VERSION_PREFIX = 'version-'
+
+
+def bundle_version(directory):
+    """Version subdirectory the manifest in directory points at, or None"""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    version = os.path.dirname(manifest.get('model_file', ''))
+    return version or None
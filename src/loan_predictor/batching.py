@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+Micro-batching for concurrent prediction requests
+
+Collects items submitted from concurrent coroutines for up to max_wait_ms
+(or until max_batch_size items are waiting) and scores them with one call,
+so N simultaneous requests pay the per-call model overhead once.
+"""
+
+import asyncio
+from collections import deque
+
+
+class MicroBatcher:
+    """Queue items and score them in batches with score_fn(list) -> list
+
+    score_fn runs in the event loop's default executor so the loop keeps
+    accepting requests while a batch is being scored. Each submit() call
+    receives the result at its own position, or the exception raised by
+    score_fn for its batch.
+    """
+
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=5):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches_scored = 0
+        self.items_scored = 0
+        self._pending = deque()
+        self._item_added = None
+        self._worker = None
+
+    async def submit(self, item):
+        """Enqueue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._item_added = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        self._pending.append((item, future))
+        self._item_added.set()
+        return await future
+
+    async def close(self):
+        """Stop the background worker and cancel requests still waiting"""
+        while self._pending:
+            _, future = self._pending.popleft()
+            future.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _wait_for_item(self, timeout=None):
+        """Wait until submit() adds an item; return False if the timeout expires first"""
+        # No await between the caller's emptiness check and clear(), so no wake-up is lost
+        self._item_added.clear()
+        try:
+            await asyncio.wait_for(self._item_added.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _collect(self):
+        """Wait for one item, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        while not self._pending:
+            await self._wait_for_item()
+
+        batch = []
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if self._pending:
+                batch.append(self._pending.popleft())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0 or not await self._wait_for_item(timeout):
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, items)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches_scored += 1
+            self.items_scored += len(items)
+            for (_, future), result in zip(batch, results):
+                # The caller may have gone away (cancelled) meanwhile
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+Bounded prediction cache
+
+A thread-safe LRU cache with per-entry time-to-live, used by the web service
+to skip re-scoring identical applicant payloads.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def make_key(applicant_data):
+    """Canonical, hashable cache key for an applicant dict (key order independent)"""
+    return json.dumps(applicant_data, sort_keys=True, default=str)
+
+
+class PredictionCache:
+    """LRU cache with TTL expiry and hit/miss counters
+
+    maxsize=0 disables caching; ttl=None keeps entries until evicted.
+    Every clear() starts a new generation; a put() tagged with an older
+    generation is dropped, so a result computed before a model swap is
+    never stored after the cache was cleared for it.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or self.clock() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, generation=None):
+        """Store value under key, evicting the least recently used entries if full
+        
+        With generation (read from self.generation before computing value),
+        the value is only stored if the cache has not been cleared since.
+        """
+        if self.maxsize <= 0:
+            return
+        expires_at = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry, e.g. after the model is reloaded; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        """Return hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'generation': self.generation
+            }
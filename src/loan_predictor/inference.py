@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+"""
+Compiled single-row inference
+
+Turns the fitted label encoders, scaler, imputation values and feature
+column order of a LoanPredictor into plain lookup tables so that one
+applicant dict can be converted into a model-ready feature vector without
+building a DataFrame.
+"""
+
+import math
+import numbers
+import threading
+
+import numpy as np
+
+# Input columns that feed the derived features and so must be real numbers
+DERIVED_INPUTS = ('ApplicantIncome', 'CoapplicantIncome', 'LoanAmount')
+
+
+def _is_missing(value):
+    """Return True for the values pandas' fillna would replace"""
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class CompiledInference:
+    """Dict-to-vector converter mirroring preprocess_data + encode_features
+
+    Missing values are filled from the training-time imputation values in
+    the same order preprocess_data applies them. preprocess(), encode() and
+    scale_row() are the compiled counterparts of the pipeline's preprocessing,
+    encoding and scaling stages. vectorize() runs them and returns None
+    whenever the applicant cannot be converted exactly (unknown categories,
+    unexpected types, gaps without a stored fill) so that the caller can
+    fall back to the pandas path, which either handles the row or raises
+    the same error it always did.
+    """
+
+    def __init__(self, feature_columns, label_encoders, scaler=None, imputation_values=None):
+        categories = {col: encoder.classes_.tolist() for col, encoder in label_encoders.items()}
+        mean, scale = (scaler.mean_, scaler.scale_) if scaler is not None else (None, None)
+        self._setup(feature_columns, categories, mean, scale, imputation_values)
+
+    @classmethod
+    def from_tables(cls, feature_columns, categories, mean=None, scale=None, imputation_values=None):
+        """Build from plain values: {column: classes in code order} and the scaler's mean and scale"""
+        compiled = cls.__new__(cls)
+        compiled._setup(feature_columns, categories, mean, scale, imputation_values)
+        return compiled
+
+    def _setup(self, feature_columns, categories, mean, scale, imputation_values):
+        imputation_values = imputation_values or {}
+        self.initial_fills = dict(imputation_values.get('initial', {}))
+        self.numeric_fills = dict(imputation_values.get('numeric', {}))
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+        self.category_tables = {
+            col: {value: code for code, value in enumerate(classes)}
+            for col, classes in categories.items()
+        }
+
+        # Per-column instructions, resolved once instead of per request
+        self.steps = []
+        for i, col in enumerate(self.feature_columns):
+            if col in self.category_tables:
+                self.steps.append((i, col, 'category'))
+            elif col in ('Total_Income', 'Income_to_Loan_Ratio'):
+                self.steps.append((i, col, 'derived'))
+            else:
+                self.steps.append((i, col, 'numeric'))
+        self.category_steps = [(i, col) for i, col, kind in self.steps if kind == 'category']
+        self.numeric_steps = [step for step in self.steps if step[2] != 'category']
+
+        if mean is not None:
+            self.mean = np.asarray(mean, dtype=np.float64)
+            self.scale = np.asarray(scale, dtype=np.float64)
+        else:
+            self.mean = self.scale = None
+
+        self._buffers = threading.local()
+
+    def _get_buffers(self):
+        """Return this thread's preallocated raw and scaled row buffers"""
+        buffers = getattr(self._buffers, 'rows', None)
+        if buffers is None:
+            buffers = (np.empty((1, self.n_features)), np.empty((1, self.n_features)))
+            self._buffers.rows = buffers
+        return buffers
+
+    def _raw_value(self, applicant, col):
+        """Look up an input value, applying the pre-derivation fill if it is missing"""
+        value = applicant[col]
+        if _is_missing(value):
+            return self.initial_fills.get(col, value)
+        return value
+
+    def _numeric_fill(self, col):
+        """Return the post-derivation median for col, or raise if none was stored"""
+        if col not in self.numeric_fills:
+            raise ValueError(col)
+        return self.numeric_fills[col]
+
+    def _derived_values(self, applicant):
+        """Compute Total_Income and Income_to_Loan_Ratio like preprocess_data"""
+        values = []
+        for col in DERIVED_INPUTS:
+            value = self._raw_value(applicant, col)
+            if isinstance(value, bool) or not isinstance(value, numbers.Real):
+                return None
+            if math.isinf(value):
+                return None
+            values.append(value)
+
+        applicant_income, coapplicant_income, loan_amount = values
+        total_income = float(applicant_income + coapplicant_income)
+        denominator = float(loan_amount * 1000)
+        if denominator == 0 or math.isnan(total_income) or math.isnan(denominator):
+            ratio = math.nan
+        else:
+            ratio = total_income / denominator
+
+        # Infinite values become NaN and are then filled with training medians
+        if not math.isfinite(total_income):
+            total_income = self._numeric_fill('Total_Income')
+        if not math.isfinite(ratio):
+            ratio = self._numeric_fill('Income_to_Loan_Ratio')
+        return {'Total_Income': float(total_income), 'Income_to_Loan_Ratio': float(ratio)}
+
+    def row_buffer(self):
+        """This thread's raw row buffer, reused by every call on the same thread"""
+        return self._get_buffers()[0]
+
+    def preprocess(self, applicant, row):
+        """Fill row's numeric and derived columns like preprocess_data; False if not representable"""
+        derived = None
+        try:
+            for i, col, kind in self.numeric_steps:
+                if kind == 'derived':
+                    if derived is None:
+                        derived = self._derived_values(applicant)
+                        if derived is None:
+                            return False
+                    row[0, i] = derived[col]
+                else:
+                    value = self._raw_value(applicant, col)
+                    if isinstance(value, bool) or value is None:
+                        return False
+                    value = float(value)
+                    if math.isinf(value):
+                        return False
+                    if math.isnan(value):
+                        value = self._numeric_fill(col)
+                    row[0, i] = value
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def encode(self, applicant, row):
+        """Fill row's category codes like encode_features; False for unseen labels"""
+        try:
+            for i, col in self.category_steps:
+                code = self.category_tables[col].get(self._raw_value(applicant, col))
+                if code is None:
+                    return False
+                row[0, i] = code
+        except (KeyError, TypeError):
+            return False
+        return True
+
+    def scale_row(self, row):
+        """Standardize row into this thread's scaled buffer and return that buffer"""
+        scaled = self._get_buffers()[1]
+        np.subtract(row, self.mean, out=scaled)
+        np.divide(scaled, self.scale, out=scaled)
+        return scaled
+
+    def vectorize(self, applicant, scale=False):
+        """Fill and return this thread's row buffer, or None if not representable
+
+        The returned array is reused by the next call on the same thread.
+        """
+        raw = self.row_buffer()
+        if not (self.preprocess(applicant, raw) and self.encode(applicant, raw)):
+            return None
+        return self.scale_row(raw) if scale else raw
@@ -2,29 +2,211 @@
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold
 from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.svm import SVC
+from sklearn.base import clone
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from sklearn.pipeline import Pipeline
 import joblib
+from joblib import Parallel, delayed
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
 import warnings
+from .artifacts import (ARTIFACT_FORMAT_VERSION, MANIFEST_FILE, MODEL_FILE, PREPROCESSING_FILE,
+                        TREES_DIRECTORY, VERSION_PREFIX, bundle_version)
+from .inference import CompiledInference
+from .pipeline import FEATURES_STEP, SCALER_STEP, build_pipeline, pipeline_from_predictor
+from .portable import export_portable
+from .profiling import SamplingProfiler, StageSpan
+from .selection import cross_validate_models
+from .tree_compiler import CompiledTreeEnsemble
+from .tuning import TUNING_CACHE_DIR, search_hyperparameters
 warnings.filterwarnings('ignore')
 
+# Models trained and scored on standardized features
+SCALED_MODELS = ['logistic', 'svm', 'svm_approx', 'sgd_logistic']
+
+# Best models that compile_inference can flatten into NumPy node arrays
+TREE_MODELS = ['random_forest', 'gradient_boosting']
+
+# Categorical columns label-encoded by encode_features
+CATEGORICAL_COLUMNS = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
+
+# Columns imputed before the derived features are built
+MODE_IMPUTED_COLUMNS = ['Gender', 'Married', 'Self_Employed', 'Loan_Amount_Term', 'Credit_History']
+MEDIAN_IMPUTED_COLUMNS = ['LoanAmount']
+
+# Loan_Status labels in LabelEncoder order; class 1 means approved
+TARGET_CLASSES = ['N', 'Y']
+
+# Columns stored as pandas category in compact mode
+COMPACT_CATEGORY_COLUMNS = CATEGORICAL_COLUMNS + ['Loan_Status']
+
+# Serializes the deferred estimator load of lazily loaded models
+_LAZY_LOAD_LOCK = threading.Lock()
+
+# Shared no-op context for untimed stages
+_UNTIMED = contextlib.nullcontext()
+
+# Default Nystroem components of the svm_approx candidate
+KERNEL_APPROXIMATION_COMPONENTS = 300
+
+# Rows per scaler call when fitting/transforming, bounding the temporaries
+SCALER_BLOCK_ROWS = 8192
+
+def _fit_scaler_in_blocks(scaler, X, block_rows=SCALER_BLOCK_ROWS):
+    """Fit a fresh clone of scaler on X block by block instead of all at once"""
+    scaler = clone(scaler)
+    for start in range(0, len(X), block_rows):
+        scaler.partial_fit(X.iloc[start:start + block_rows])
+    return scaler
+
+def _scale_in_blocks(scaler, X, block_rows=SCALER_BLOCK_ROWS):
+    """Scale a DataFrame into one C-ordered float64 array, block by block
+    
+    The estimators need C order; scaling the whole frame at once would
+    produce a Fortran-ordered array that each of them copies again.
+    """
+    scaled = np.empty(X.shape, dtype=np.float64)
+    for start in range(0, len(X), block_rows):
+        scaled[start:start + block_rows] = scaler.transform(X.iloc[start:start + block_rows])
+    return scaled
+
+def approximate_svm(n_components=KERNEL_APPROXIMATION_COMPONENTS, calibration_cv=3, random_state=42):
+    """RBF kernel SVM approximation whose cost grows linearly with the rows
+    
+    A Nystroem map onto n_components kernel features feeds a linear SVM,
+    and the probabilities come from a sigmoid fitted on calibration_cv
+    held-out folds. Predicting costs n_components kernel evaluations per
+    row instead of one per support vector.
+    """
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.svm import LinearSVC
+    # gamma=None is 1 / n_features, what SVC's gamma='scale' gives on standardized features
+    approximation = Pipeline([
+        ('kernel', Nystroem(kernel='rbf', n_components=n_components, random_state=random_state)),
+        ('linear', LinearSVC(random_state=random_state))
+    ])
+    return CalibratedClassifierCV(approximation, method='sigmoid', cv=calibration_cv)
+
+def default_models(kernel_approximation=None):
+    """The candidate estimators train_models compares unless self.models is replaced
+    
+    kernel_approximation=None includes the exact RBF SVC as 'svm'; an int
+    replaces it with 'svm_approx', approximate_svm with that many components.
+    """
+    # Imported here so loading and scoring a saved model skips the unused estimator families
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.svm import SVC
+    models = {
+        'logistic': LogisticRegression(random_state=42),
+        'random_forest': RandomForestClassifier(random_state=42, n_estimators=100),
+        'gradient_boosting': GradientBoostingClassifier(random_state=42)
+    }
+    if kernel_approximation is None:
+        models['svm'] = SVC(random_state=42, probability=True)
+    else:
+        models['svm_approx'] = approximate_svm(kernel_approximation)
+    return models
+
+def _fit_and_evaluate(name, model, X_train, X_test, y_train, y_test):
+    """Fit one candidate model and return it with its test accuracy, fit time and stage events
+    
+    The events are collected here rather than sent to the predictor's hooks
+    because this may run in a worker process.
+    """
+    print(f"Training {name}...")
+    events = []
+    with StageSpan('fit', events.append, {'model': name}):
+        model.fit(X_train, y_train)
+    
+    # Evaluate
+    with StageSpan('evaluate', events.append, {'model': name}):
+        predictions = model.predict(X_test)
+        accuracy = accuracy_score(y_test, predictions)
+    return name, model, accuracy, events[0]['seconds'], events
+
+@contextlib.contextmanager
+def _sampled(profiler, stage):
+    """Run a predict stage while the sampling profiler records the calling thread"""
+    with profiler.request(), stage:
+        yield
+
 class LoanPredictor:
-    def __init__(self):
-        self.models = {
-            'logistic': LogisticRegression(random_state=42),
-            'random_forest': RandomForestClassifier(random_state=42, n_estimators=100),
-            'gradient_boosting': GradientBoostingClassifier(random_state=42),
-            'svm': SVC(random_state=42, probability=True)
-        }
+    def __init__(self, compact=False, kernel_approximation=None):
+        """compact=True keeps string columns as pandas category, downcasts
+        numeric columns where lossless and encodes through category codes,
+        cutting the memory used by preprocessing large training sets.
+        kernel_approximation=n swaps the exact SVC candidate, whose fit
+        time grows quadratically with the rows, for an n-component
+        Nystroem approximation (see approximate_svm)."""
+        # Candidate estimators; the defaults are created on first access
+        self._models = None
+        self.kernel_approximation = kernel_approximation
         self.label_encoders = {}
         self.scaler = StandardScaler()
-        self.best_model = None
+        self._best_model = None
+        self._lazy_model = None
+        self._compiled_trees_path = None
         self.feature_columns = None
+        self.imputation_values = {}
+        self.fit_times = {}
+        self.cv_results = {}
+        self.tuning_results = {}
+        self.compiled_inference = None
+        self.compiled_trees = None
+        self.compact = compact
+        # Optional callable(stage, seconds) told how long each stage took
+        self.stage_observer = None
+        # Callables receiving a profiling event dict per stage (see profiling.py)
+        self.profiling_hooks = []
+        self.profiler = None
         
+    @property
+    def models(self):
+        """Candidate estimators by name (default_models(self.kernel_approximation) until replaced)"""
+        if self._models is None:
+            self._models = default_models(self.kernel_approximation)
+        return self._models
+    
+    @models.setter
+    def models(self, value):
+        self._models = value
+    
+    @property
+    def best_model(self):
+        """(name, estimator) of the selected model, loading it on first access if deferred"""
+        if self._best_model is None and self._lazy_model is not None:
+            with _LAZY_LOAD_LOCK:
+                if self._lazy_model is not None:
+                    name, path, mmap_mode = self._lazy_model
+                    self._best_model = (name, joblib.load(path, mmap_mode=mmap_mode))
+                    self._lazy_model = None
+        return self._best_model
+    
+    @best_model.setter
+    def best_model(self, value):
+        self._best_model = value
+        self._lazy_model = None
+        self._compiled_trees_path = None
+        # Compiled state describes the previous model
+        self.compiled_inference = None
+        self.compiled_trees = None
+    
+    @property
+    def best_model_name(self):
+        """Name of the selected model, without forcing a deferred load"""
+        if self._lazy_model is not None:
+            return self._lazy_model[0]
+        return self._best_model[0] if self._best_model is not None else None
+    
     def create_sample_data(self, n_samples=1000):
         """Generate sample loan data for demonstration"""
         np.random.seed(42)
@@ -59,39 +241,147 @@ class LoanPredictor:
         
         return df
     
-    def preprocess_data(self, df):
-        """Preprocess the data for training"""
-        df = df.copy()
+    def fit_imputation(self, df):
+        """Learn and store the missing-value fills used by preprocess_data"""
+        self.imputation_values = self._compute_imputation_values(df)
+        return self.imputation_values
+    
+    @classmethod
+    def _compute_imputation_values(cls, df):
+        """Compute missing-value fills from a training frame
+        
+        Modes/medians for the raw columns are taken from df; medians for the
+        numeric columns (including derived features) are taken after the
+        derived features are built, matching the order preprocess_data
+        applies them in.
+        """
+        initial = {}
+        for col in MODE_IMPUTED_COLUMNS:
+            if col in df.columns:
+                mode = df[col].mode()
+                if len(mode):
+                    initial[col] = mode[0]
+        for col in MEDIAN_IMPUTED_COLUMNS:
+            if col in df.columns and df[col].notna().any():
+                initial[col] = df[col].median()
+        
+        # Only numeric and imputed columns are needed, so the string columns are not copied
+        columns = [col for col in df.columns if col in initial or pd.api.types.is_numeric_dtype(df[col])]
+        df = cls._add_derived_features(cls._fill(df[columns].copy(), initial))
+        numeric = {}
+        for col in df.select_dtypes(include=[np.number]).columns:
+            if df[col].notna().any():
+                numeric[col] = df[col].median()
+        
+        return {'initial': initial, 'numeric': numeric}
+    
+    @staticmethod
+    def _fill(df, values):
+        """Fill missing values column by column from a precomputed mapping
+        
+        Works in place; columns without missing values are left untouched.
+        """
+        for col, value in values.items():
+            if col in df.columns and df[col].isna().any():
+                column = df[col]
+                if isinstance(column.dtype, pd.CategoricalDtype) and value not in column.cat.categories:
+                    column = column.cat.add_categories([value])
+                df[col] = column.fillna(value)
+        return df
+    
+    @staticmethod
+    def _to_categories(df):
+        """Return df with the string columns converted to pandas category"""
+        return df.astype({col: 'category' for col in COMPACT_CATEGORY_COLUMNS if col in df.columns})
+    
+    @staticmethod
+    def _downcast_numeric(df):
+        """Shrink numeric columns to the smallest dtype that holds every value exactly"""
+        for col in df.select_dtypes(include=[np.number]).columns:
+            values = df[col]
+            if values.dtype.kind == 'f':
+                if values.notna().all() and (values % 1 == 0).all():
+                    values = pd.to_numeric(values, downcast='integer')
+                else:
+                    as_float32 = values.astype(np.float32)
+                    if ((as_float32 == values) | values.isna()).all():
+                        values = as_float32
+            else:
+                values = pd.to_numeric(values, downcast='integer')
+            df[col] = values
+        return df
+    
+    @staticmethod
+    def _add_derived_features(df):
+        """Create derived features (in place) and turn infinite values into NaN"""
+        if 'ApplicantIncome' in df.columns and 'CoapplicantIncome' in df.columns:
+            df['Total_Income'] = df['ApplicantIncome'] + df['CoapplicantIncome']
+            if 'LoanAmount' in df.columns:
+                df['Income_to_Loan_Ratio'] = df['Total_Income'] / (df['LoanAmount'] * 1000)
+        
+        # Handle infinite and very large values; only float columns can hold them
+        for col in df.select_dtypes(include=[np.floating]).columns:
+            infinite = np.isinf(df[col].to_numpy())
+            if infinite.any():
+                df[col] = df[col].mask(infinite)
+        return df
+    
+    def preprocess_data(self, df, fit=True, inplace=False):
+        """Preprocess the data for training
+        
+        With fit=True the imputation values are learned from df and stored;
+        with fit=False the stored training-time values are applied, so the
+        result for a row does not depend on the rest of the frame. With
+        inplace=True df itself is modified and returned instead of a copy.
+        """
+        if fit:
+            self.fit_imputation(df)
+        
+        imputation_values = self.imputation_values
+        if not imputation_values:
+            # Bundles saved before imputation values were persisted
+            imputation_values = self._compute_imputation_values(df)
+        
+        if not inplace:
+            # Category conversion already returns a new frame
+            df = self._to_categories(df) if self.compact else df.copy()
+        elif self.compact:
+            for col in COMPACT_CATEGORY_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
         
         # Handle missing values
-        df['Gender'].fillna(df['Gender'].mode()[0], inplace=True)
-        df['Married'].fillna(df['Married'].mode()[0], inplace=True)
-        df['Self_Employed'].fillna(df['Self_Employed'].mode()[0], inplace=True)
-        df['LoanAmount'].fillna(df['LoanAmount'].median(), inplace=True)
-        df['Loan_Amount_Term'].fillna(df['Loan_Amount_Term'].mode()[0], inplace=True)
-        df['Credit_History'].fillna(df['Credit_History'].mode()[0], inplace=True)
+        df = self._fill(df, imputation_values['initial'])
         
         # Create derived features
-        df['Total_Income'] = df['ApplicantIncome'] + df['CoapplicantIncome']
-        df['Income_to_Loan_Ratio'] = df['Total_Income'] / (df['LoanAmount'] * 1000)
-        
-        # Handle infinite and very large values
-        df = df.replace([np.inf, -np.inf], np.nan)
+        df = self._add_derived_features(df)
         
         # Fill NaN values for numeric columns only
         numeric_columns = df.select_dtypes(include=[np.number]).columns
+        numeric_values = imputation_values['numeric']
         for col in numeric_columns:
-            df[col] = df[col].fillna(df[col].median())
+            if col in numeric_values and df[col].isna().any():
+                df[col] = df[col].fillna(numeric_values[col])
+        
+        if self.compact:
+            df = self._downcast_numeric(df)
         
         return df
     
-    def encode_features(self, df, fit=True):
-        """Encode categorical features"""
-        df = df.copy()
-        categorical_cols = ['Gender', 'Married', 'Education', 'Self_Employed', 'Property_Area']
+    def encode_features(self, df, fit=True, inplace=False):
+        """Encode categorical features
+        
+        In compact mode the codes come from pandas categories (int8) instead
+        of LabelEncoder.transform; the stored encoders learn the same sorted
+        classes either way.
+        """
+        if not inplace:
+            df = df.copy()
         
-        for col in categorical_cols:
-            if fit:
+        for col in CATEGORICAL_COLUMNS:
+            if self.compact:
+                df[col] = self._encode_category_codes(col, df[col], fit)
+            elif fit:
                 self.label_encoders[col] = LabelEncoder()
                 df[col] = self.label_encoders[col].fit_transform(df[col])
             else:
@@ -99,45 +389,93 @@ class LoanPredictor:
         
         return df
     
-    def train_models(self, df):
-        """Train all models and select the best one"""
+    def _encode_category_codes(self, col, values, fit):
+        """Encode one column through category codes, matching LabelEncoder's classes"""
+        if fit:
+            encoder = LabelEncoder()
+            encoder.classes_ = np.array(sorted(values.dropna().unique().tolist()), dtype=object)
+            self.label_encoders[col] = encoder
+        classes = self.label_encoders[col].classes_
+        # -1 marks labels missing from classes
+        codes = pd.Index(classes).get_indexer(values)
+        if (codes < 0).any():
+            unseen = sorted(set(values[codes < 0].astype(str)))
+            raise ValueError(f"{col} contains previously unseen labels: {unseen}")
+        # The smallest signed type, as category codes would use
+        return pd.Series(codes.astype(np.min_scalar_type(-len(classes))), index=values.index, name=col)
+    
+    def transform(self, df, fit=True, inplace=False):
+        """Preprocess and encode df in one pass
+        
+        Equivalent to encode_features(preprocess_data(df, fit), fit) but the
+        frame is copied at most once; with inplace=True a caller-owned df is
+        transformed without any copy.
+        """
+        df = self.preprocess_data(df, fit=fit, inplace=inplace)
+        return self.encode_features(df, fit=fit, inplace=True)
+    
+    def train_models(self, df, n_jobs=None, backend=None, inplace=False):
+        """Train all models and select the best one
+        
+        n_jobs and backend are passed to joblib.Parallel to fit the candidate
+        models concurrently (processes by default, or backend='threading').
+        The default n_jobs=None fits them one after another. Per-model fit
+        times are stored in self.fit_times. With inplace=True df is
+        preprocessed in place (and loses its Loan_Status column) instead of
+        being copied.
+        """
         print("Preprocessing data...")
-        df = self.preprocess_data(df)
-        df = self.encode_features(df, fit=True)
+        # transform() split in two so each step is reported separately
+        with self._stage('preprocess_data', rows=len(df)):
+            X = self.preprocess_data(df, fit=True, inplace=inplace)
+        del df
+        with self._stage('encode_features', rows=len(X)):
+            X = self.encode_features(X, fit=True, inplace=True)
         
-        # Separate features and target
-        X = df.drop(['Loan_Status'], axis=1)
-        y = LabelEncoder().fit_transform(df['Loan_Status'])
+        # Separate features and target; pop avoids copying the feature columns
+        y = LabelEncoder().fit_transform(X.pop('Loan_Status'))
         
         self.feature_columns = X.columns.tolist()
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        # Split data, then drop the full frame when it is our own copy
+        with self._stage('split', rows=len(X)):
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        del X
+        
+        # Scale features; the scaled copies are only needed by the scaled models
+        with self._stage('scaling', rows=len(X_train) + len(X_test)):
+            self.scaler = _fit_scaler_in_blocks(self.scaler, X_train)
+            if any(name in SCALED_MODELS for name in self.models):
+                X_train_scaled = _scale_in_blocks(self.scaler, X_train)
+                X_test_scaled = _scale_in_blocks(self.scaler, X_test)
+            else:
+                X_train_scaled = X_test_scaled = None
         
-        # Scale features
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        self.compiled_inference = None
+        self.compiled_trees = None
         
         print("\nTraining models...")
+        scaled_data = (X_train_scaled, X_test_scaled, y_train, y_test)
+        raw_data = (X_train, X_test, y_train, y_test)
+        outcomes = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(_fit_and_evaluate)(name, model, *(scaled_data if name in SCALED_MODELS else raw_data))
+            for name, model in self.models.items()
+        )
+        
         best_score = 0
         results = {}
+        self.fit_times = {}
         
-        for name, model in self.models.items():
-            print(f"Training {name}...")
-            
-            # Train model
-            if name in ['logistic', 'svm']:
-                model.fit(X_train_scaled, y_train)
-                predictions = model.predict(X_test_scaled)
-            else:
-                model.fit(X_train, y_train)
-                predictions = model.predict(X_test)
-            
-            # Evaluate
-            accuracy = accuracy_score(y_test, predictions)
+        # Select in self.models order so ties resolve exactly as in a sequential run
+        for name, model, accuracy, fit_time, events in outcomes:
+            # Worker processes return fitted copies of the estimators
+            self.models[name] = model
             results[name] = accuracy
+            self.fit_times[name] = fit_time
+            for event in events:
+                self._emit_stage(event)
             
-            print(f"{name} accuracy: {accuracy:.4f}")
+            print(f"{name} accuracy: {accuracy:.4f} (fit time: {fit_time:.2f}s)")
             
             if accuracy > best_score:
                 best_score = accuracy
@@ -146,59 +484,513 @@ class LoanPredictor:
         print(f"\nBest model: {self.best_model[0]} with accuracy: {best_score:.4f}")
         return results
     
-    def predict_loan(self, applicant_data):
-        """Predict loan approval for a single applicant"""
-        if self.best_model is None:
+    def select_model_cv(self, df, n_splits=5, n_jobs=None, backend=None, prune=True, min_folds=2, eta=2):
+        """Select the best model with stratified k-fold cross-validation
+        
+        The (model, fold) fits run in parallel through joblib. With prune=True,
+        candidates are dropped successive-halving style: after min_folds folds
+        only the top 1/eta are kept and the fold budget grows by eta each
+        round. The winner is refitted on the full data and becomes best_model.
+        """
+        print("Preprocessing data...")
+        X = self.transform(df, fit=True)
+        y = LabelEncoder().fit_transform(X.pop('Loan_Status'))
+        self.feature_columns = X.columns.tolist()
+        
+        print(f"\nCross-validating models ({n_splits} folds)...")
+        results = cross_validate_models(
+            self.models, X, y, scaled_models=SCALED_MODELS, n_splits=n_splits,
+            n_jobs=n_jobs, backend=backend, prune=prune, min_folds=min_folds, eta=eta
+        )
+        for name, result in results.items():
+            note = ' (pruned)' if result['pruned'] else ''
+            print(f"{name}: {result['mean_accuracy']:.4f} (+/- {result['std_accuracy'] * 2:.4f}) "
+                  f"over {len(result['scores'])} folds{note}")
+        
+        # Only candidates that survived every round are eligible
+        best_name = max(
+            (name for name in results if not results[name]['pruned']),
+            key=lambda name: results[name]['mean_accuracy']
+        )
+        
+        print(f"\nRefitting {best_name} on the full data...")
+        model = self.models[best_name]
+        if best_name in SCALED_MODELS:
+            model.fit(self.scaler.fit_transform(X), y)
+        else:
+            self.scaler.fit(X)
+            model.fit(X, y)
+        
+        self.best_model = (best_name, model)
+        self.compiled_inference = None
+        self.compiled_trees = None
+        self.cv_results = results
+        
+        print(f"Best model: {best_name} with CV accuracy: {results[best_name]['mean_accuracy']:.4f}")
+        return results
+    
+    def make_pipeline(self, name, memory=None):
+        """Unfitted sklearn Pipeline (features -> scaler if needed -> model) for one candidate"""
+        return build_pipeline(name, clone(self.models[name]), scaled=name in SCALED_MODELS,
+                              memory=memory, compact=self.compact)
+    
+    def select_model_pipeline(self, df, n_splits=5, n_jobs=None, memory=None):
+        """Select the best model with sklearn's cross_val_score over full pipelines
+        
+        Every candidate is a Pipeline sharing the same memory, so the
+        preprocessing fitted on a fold is computed once and reused by the
+        other candidates. memory defaults to a temporary directory removed
+        afterwards. The winner is refitted on all rows and adopted.
+        """
+        X = df.drop(['Loan_Status'], axis=1)
+        y = LabelEncoder().fit_transform(df['Loan_Status'])
+        cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+        
+        cache_dir = tempfile.mkdtemp(prefix='loan_predictor_') if memory is None else None
+        try:
+            results = {}
+            print(f"Cross-validating pipelines ({n_splits} folds)...")
+            for name in self.models:
+                pipeline = self.make_pipeline(name, memory=memory or cache_dir)
+                scores = cross_val_score(pipeline, X, y, cv=cv, n_jobs=n_jobs)
+                results[name] = {'mean_accuracy': float(scores.mean()), 'std_accuracy': float(scores.std()),
+                                 'scores': scores.tolist()}
+                print(f"{name}: {scores.mean():.4f} (+/- {scores.std() * 2:.4f})")
+            
+            best_name = max(results, key=lambda name: results[name]['mean_accuracy'])
+            print(f"\nRefitting {best_name} on the full data...")
+            pipeline = self.make_pipeline(best_name).fit(X, y)
+        finally:
+            if cache_dir is not None:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+        
+        self.use_pipeline(pipeline)
+        self.models[best_name] = pipeline.steps[-1][1]
+        self.cv_results = results
+        print(f"Best model: {best_name} with CV accuracy: {results[best_name]['mean_accuracy']:.4f}")
+        return results
+    
+    def to_pipeline(self):
+        """The trained preprocessing, scaler and best model as one fitted sklearn Pipeline"""
+        if self.best_model_name is None:
+            raise ValueError("Model not trained yet. Call train_models() first.")
+        return pipeline_from_predictor(self, scaled=self.best_model_name in SCALED_MODELS)
+    
+    def use_pipeline(self, pipeline):
+        """Adopt the state of a fitted pipeline built by make_pipeline or to_pipeline"""
+        features = pipeline.named_steps[FEATURES_STEP]
+        scaler = pipeline.named_steps[SCALER_STEP]
+        name, model = pipeline.steps[-1]
+        
+        self.best_model = (name, model)
+        self.label_encoders = features.label_encoders_
+        self.imputation_values = features.imputation_values_
+        self.feature_columns = list(features.feature_columns_)
+        self.compact = features.compact
+        self.scaler = StandardScaler() if isinstance(scaler, str) else scaler
+    
+    def retrain_incremental(self, new_df, filename=None, n_new_estimators=None):
+        """Update the best model with new applications instead of retraining everything
+        
+        Loads the bundle at filename first if given. The imputation values and
+        label encoders are kept; the scaler's running statistics are extended
+        with partial_fit. The model is then updated in place:
+        
+        - random_forest: n_new_estimators trees fitted on new_df are added
+          (tree models need both classes in new_df)
+        - gradient_boosting: n_new_estimators boosting stages are fitted on
+          new_df, continuing from the existing ensemble
+        - models with partial_fit (sgd_logistic, naive_bayes): one pass over new_df
+        
+        n_new_estimators defaults to a tenth of the current ensemble size.
+        The cost grows with len(new_df), not with the full history. Other
+        models (logistic, svm, svm_approx) have no incremental path; use
+        train_models for them. A warm-started logistic fit only starts from
+        the current coefficients and still converges to the optimum of
+        new_df alone, discarding the history.
+        """
+        if filename is not None:
+            # Memory-mapped arrays are read-only, so load everything into memory
+            self.load_model(filename, mmap_mode=None, lazy=False)
+        if self.best_model_name is None:
             raise ValueError("Model not trained yet. Call train_models() first.")
         
-        # Convert to DataFrame
-        df = pd.DataFrame([applicant_data])
+        name, model = self.best_model
+        if not (hasattr(model, 'partial_fit') or name in TREE_MODELS):
+            raise ValueError(f"{name} does not support incremental retraining; use train_models()")
+        
+        X = self.transform(new_df, fit=False)
+        target = LabelEncoder()
+        target.classes_ = np.array(TARGET_CLASSES, dtype=object)
+        y = target.transform(X.pop('Loan_Status'))
+        X = X[self.feature_columns]
+        if name in TREE_MODELS and len(np.unique(y)) < len(TARGET_CLASSES):
+            # A warm-started fit would reset classes_ to the labels in new_df
+            raise ValueError(f"{name} can only be updated with rows of both classes {TARGET_CLASSES}")
+        
+        self.scaler.partial_fit(X)
+        if name in SCALED_MODELS:
+            X = self.scaler.transform(X)
+        
+        print(f"Updating {name} with {len(y)} new rows...")
+        start = time.perf_counter()
+        if hasattr(model, 'partial_fit'):
+            model.partial_fit(X, y)
+        elif name in TREE_MODELS:
+            n_estimators = model.n_estimators
+            added = n_new_estimators or max(1, n_estimators // 10)
+            model.set_params(warm_start=True, n_estimators=n_estimators + added)
+            try:
+                model.fit(X, y)
+            except Exception:
+                model.set_params(n_estimators=n_estimators)
+                raise
+            finally:
+                model.set_params(warm_start=False)
+        fit_time = time.perf_counter() - start
+        
+        self.models[name] = model
+        # Re-assigning drops compiled state built for the previous model
+        self.best_model = (name, model)
+        print(f"{name} updated in {fit_time:.2f}s")
+        return {'model': name, 'rows': len(y), 'fit_time': fit_time}
+    
+    def tune_models(self, df, n_iter=10, strategy='halving', n_splits=5, min_folds=1, eta=3,
+                    n_jobs=None, backend=None, cache_dir=TUNING_CACHE_DIR, search_spaces=None):
+        """Tune the candidate models' hyperparameters and store the winners in self.models
+        
+        Runs tuning.search_hyperparameters (random or successive-halving
+        search, fits spread across cores by joblib) over the encoded data.
+        Finished fits are cached in cache_dir, so an interrupted or widened
+        search resumes instead of starting over. Call train_models or
+        select_model_cv afterwards to fit and select among the tuned models.
+        """
+        print("Preprocessing data...")
+        X = self.transform(df, fit=True)
+        y = LabelEncoder().fit_transform(X.pop('Loan_Status'))
+        self.feature_columns = X.columns.tolist()
+        
+        print(f"\nTuning models ({strategy} search, {n_splits} folds)...")
+        results = search_hyperparameters(
+            self.models, X, y, scaled_models=SCALED_MODELS, search_spaces=search_spaces, n_iter=n_iter,
+            strategy=strategy, n_splits=n_splits, min_folds=min_folds, eta=eta, n_jobs=n_jobs,
+            backend=backend, cache_dir=cache_dir
+        )
+        for name, result in results.items():
+            self.models[name] = clone(self.models[name]).set_params(**result['best_params'])
+            print(f"{name}: {result['best_score']:.4f} with {result['best_params'] or 'current parameters'} "
+                  f"({result['evaluated']} fits, {result['cached']} cached)")
+        
+        self.tuning_results = results
+        return results
+    
+    def train_streaming(self, source, chunksize=100000, models=None, n_epochs=1, reservoir_size=100000):
+        """Train from data streamed in chunks, without loading it all into memory
+        
+        source is a .csv, .jsonl or .parquet path, or a zero-argument callable
+        returning a fresh iterable of DataFrames for each pass. Imputation
+        values, encoders and the scaler are fitted from running statistics
+        (medians from a reservoir sample of reservoir_size values), then the
+        incremental candidates (default: SGD logistic regression and Gaussian
+        naive Bayes) are trained with partial_fit for n_epochs passes. Every
+        fifth row is held out to pick the best model.
+        """
+        # Deferred like the default estimators; only streaming training needs them
+        from .streaming import train_streaming
+        models, results = train_streaming(
+            self, source, chunksize=chunksize, models=models, n_epochs=n_epochs,
+            reservoir_size=reservoir_size, scaled_models=SCALED_MODELS
+        )
+        
+        best_score = -1
+        for name, accuracy in results.items():
+            print(f"{name} accuracy: {accuracy:.4f}")
+            if accuracy > best_score:
+                best_score = accuracy
+                self.best_model = (name, models[name])
+        
+        print(f"\nBest model: {self.best_model[0]} with accuracy: {best_score:.4f}")
+        return results
+    
+    def _stage(self, name, **context):
+        """Context manager reporting one stage to stage_observer and profiling_hooks (no-op when unset)"""
+        if self.stage_observer is None and not self.profiling_hooks:
+            return _UNTIMED
+        return StageSpan(name, self._emit_stage, context)
+    
+    def _emit_stage(self, event):
+        if self.stage_observer is not None:
+            self.stage_observer(event['stage'], event['seconds'])
+        for hook in self.profiling_hooks:
+            hook(event)
+    
+    def _request(self, rows):
+        """Context for one predict_loan/predict_batch call: the 'predict' stage, sampled while profiling"""
+        stage = self._stage('predict', rows=rows)
+        profiler = self.profiler
+        if profiler is None:
+            return stage
+        if profiler.finished:
+            self.profiler = None
+            return stage
+        return _sampled(profiler, stage)
+    
+    def profile_requests(self, path, n_requests, interval=0.001):
+        """Sample the next n_requests predictions and write a flame graph input file to path
         
-        # Preprocess
-        df = self.preprocess_data(df)
-        df = self.encode_features(df, fit=False)
+        The file holds collapsed stacks, one 'frame;frame;frame count' line
+        per distinct stack, as read by flamegraph.pl or speedscope. Returns
+        the SamplingProfiler; its stop() writes the file early.
+        """
+        if self.profiler is not None:
+            self.profiler.stop()
+        self.profiler = SamplingProfiler(path, n_requests, interval)
+        return self.profiler
+    
+    def _prepare_features(self, df):
+        """Preprocess, encode and align a frame of applicants with the training columns"""
+        # Same single copy as transform(), timed per stage
+        with self._stage('preprocess_data'):
+            df = self.preprocess_data(df, fit=False)
+        with self._stage('encode_features'):
+            df = self.encode_features(df, fit=False, inplace=True)
         
         # Ensure all required columns are present
         for col in self.feature_columns:
             if col not in df.columns:
                 df[col] = 0
         
-        df = df[self.feature_columns]
+        return df[self.feature_columns]
+    
+    def _predict_arrays(self, X, scaled=False):
+        """Return predicted labels and class probabilities from a single predict_proba call"""
+        if self.compiled_trees is not None:
+            try:
+                values = np.asarray(X, dtype=np.float64)
+            except (TypeError, ValueError):
+                values = None
+            # Non-finite rows go through sklearn, which handles missing values
+            if values is not None and np.isfinite(values).all():
+                with self._stage('predict_proba'):
+                    probabilities = self.compiled_trees.predict_proba(values)
+                    predictions = self.compiled_trees.classes.take(np.argmax(probabilities, axis=1))
+                return predictions, probabilities
         
-        # Scale if necessary
         model_name, model = self.best_model
-        if model_name in ['logistic', 'svm']:
-            df_scaled = self.scaler.transform(df)
-            prediction = model.predict(df_scaled)[0]
-            probability = model.predict_proba(df_scaled)[0]
-        else:
-            prediction = model.predict(df)[0]
-            probability = model.predict_proba(df)[0]
+        if model_name in SCALED_MODELS and not scaled:
+            with self._stage('scaling'):
+                X = self.scaler.transform(X)
+        
+        with self._stage('predict_proba'):
+            probabilities = model.predict_proba(X)
+            if model_name == 'svm':
+                # Platt-scaled probabilities can disagree with the SVC decision function
+                predictions = model.predict(X)
+            else:
+                predictions = model.classes_.take(np.argmax(probabilities, axis=1))
+        
+        return predictions, probabilities
+    
+    def predict_loan(self, applicant_data):
+        """Predict loan approval for a single applicant"""
+        if self.best_model_name is None:
+            raise ValueError("Model not trained yet. Call train_models() first.")
+        
+        with self._request(rows=1):
+            predictions = None
+            if self.compiled_inference is not None:
+                # Compiled preprocessing, encoding and scaling, reported as the same stages as the pandas path
+                compiled = self.compiled_inference
+                row = compiled.row_buffer()
+                with self._stage('preprocess_data'):
+                    representable = compiled.preprocess(applicant_data, row)
+                if representable:
+                    with self._stage('encode_features'):
+                        representable = compiled.encode(applicant_data, row)
+                if representable:
+                    if self.best_model_name in SCALED_MODELS:
+                        with self._stage('scaling'):
+                            row = compiled.scale_row(row)
+                    predictions, probabilities = self._predict_arrays(row, scaled=True)
+            
+            if predictions is None:
+                # Convert to DataFrame
+                df = self._prepare_features(pd.DataFrame([applicant_data]))
+                predictions, probabilities = self._predict_arrays(df)
         
         return {
-            'approved': bool(prediction),
-            'probability': float(probability[1]),  # Probability of approval
-            'model_used': model_name
+            'approved': bool(predictions[0]),
+            'probability': float(probabilities[0, 1]),  # Probability of approval
+            'model_used': self.best_model_name
         }
     
-    def save_model(self, filename='loan_predictor_model.pkl'):
-        """Save the trained model"""
-        model_data = {
-            'best_model': self.best_model,
+    def predict_batch(self, df):
+        """Predict loan approval for many applicants at once
+        
+        Accepts a DataFrame (or a list of applicant dicts) and returns a
+        DataFrame with 'approved', 'probability' and 'model_used' columns,
+        indexed like the input.
+        """
+        if self.best_model_name is None:
+            raise ValueError("Model not trained yet. Call train_models() first.")
+        
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame(list(df))
+        
+        if len(df) == 0:
+            return pd.DataFrame({
+                'approved': pd.Series([], dtype=bool),
+                'probability': pd.Series([], dtype=float),
+                'model_used': pd.Series([], dtype=object)
+            }, index=df.index)
+        
+        with self._request(rows=len(df)):
+            X = self._prepare_features(df)
+            predictions, probabilities = self._predict_arrays(X)
+        
+        return pd.DataFrame({
+            'approved': predictions.astype(bool),
+            'probability': probabilities[:, 1].astype(float),
+            'model_used': self.best_model_name
+        }, index=df.index)
+    
+    def compile_inference(self, trees=True):
+        """Compile the fitted preprocessing into lookup tables for fast single-row scoring
+        
+        After this call predict_loan converts applicant dicts straight into a
+        NumPy row without pandas, falling back to the DataFrame path for rows
+        the compiled tables cannot represent exactly.
+        
+        With trees=True a random_forest or gradient_boosting best model is
+        also flattened into NumPy node arrays (see tree_compiler), which
+        predict_loan and predict_batch then use instead of sklearn.
+        """
+        if self.best_model_name is None:
+            raise ValueError("Model not trained yet. Call train_models() first.")
+        
+        scaler = self.scaler if self.best_model_name in SCALED_MODELS else None
+        self.compiled_inference = CompiledInference(
+            self.feature_columns, self.label_encoders, scaler, self.imputation_values
+        )
+        
+        self.compiled_trees = None
+        if trees and self.best_model_name in TREE_MODELS:
+            if self._compiled_trees_path is not None:
+                # Saved alongside a directory bundle; node arrays are memory-mapped
+                self.compiled_trees = CompiledTreeEnsemble.load(self._compiled_trees_path, mmap_mode='r')
+            else:
+                self.compiled_trees = CompiledTreeEnsemble.from_estimator(self.best_model[1])
+        return self.compiled_inference
+    
+    def save_pipeline(self, filename='loan_predictor_pipeline.pkl'):
+        """Save to_pipeline() with joblib; load_model (or plain joblib.load) reads it back"""
+        joblib.dump(self.to_pipeline(), filename)
+        print(f"Pipeline saved to {filename}")
+    
+    def export_portable(self, directory):
+        """Export the preprocessing and best model for the NumPy-only runtime
+        
+        portable.PortableModel.load(directory) then scores applicants like
+        predict_loan without pandas, scikit-learn or pickles.
+        """
+        manifest = export_portable(self, directory)
+        print(f"Portable model exported to {directory}")
+        return manifest
+    
+    def save_model(self, filename='loan_predictor_model.pkl', mmap=False):
+        """Save the trained model
+        
+        With mmap=True, filename is a directory holding a small JSON manifest,
+        the preprocessing state and the estimator as separate uncompressed
+        joblib files, so load_model can memory-map the estimator's arrays
+        and defer loading it until the first prediction.
+        
+        Saving into an existing directory never rewrites files a loaded
+        predictor may have mapped: the new files go into a fresh version
+        subdirectory and the manifest is replaced atomically to point at it.
+        The version it replaced is kept, so predictors that loaded it (and
+        have not loaded their estimator yet) keep working; older versions
+        are removed.
+        """
+        preprocessing = {
             'label_encoders': self.label_encoders,
             'scaler': self.scaler,
-            'feature_columns': self.feature_columns
+            'feature_columns': self.feature_columns,
+            'imputation_values': self.imputation_values
+        }
+        if not mmap:
+            joblib.dump(dict(preprocessing, best_model=self.best_model), filename)
+            print(f"Model saved to {filename}")
+            return
+        
+        model_name, model = self.best_model
+        os.makedirs(filename, exist_ok=True)
+        previous = bundle_version(filename)
+        version = f'{VERSION_PREFIX}{time.time_ns()}'
+        os.makedirs(os.path.join(filename, version))
+        joblib.dump(preprocessing, os.path.join(filename, version, PREPROCESSING_FILE))
+        joblib.dump(model, os.path.join(filename, version, MODEL_FILE))
+        if model_name in TREE_MODELS:
+            CompiledTreeEnsemble.from_estimator(model).save(os.path.join(filename, version, TREES_DIRECTORY))
+        
+        # The manifest is replaced last so a partially written version never loads
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'model_name': model_name,
+            'feature_columns': self.feature_columns,
+            'preprocessing_file': os.path.join(version, PREPROCESSING_FILE),
+            'model_file': os.path.join(version, MODEL_FILE),
+            'compiled_trees': os.path.join(version, TREES_DIRECTORY) if model_name in TREE_MODELS else None
         }
-        joblib.dump(model_data, filename)
+        temporary = os.path.join(filename, f'{MANIFEST_FILE}.{os.getpid()}.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temporary, os.path.join(filename, MANIFEST_FILE))
+        
+        for entry in os.listdir(filename):
+            if entry.startswith(VERSION_PREFIX) and entry not in (version, previous):
+                shutil.rmtree(os.path.join(filename, entry), ignore_errors=True)
         print(f"Model saved to {filename}")
     
-    def load_model(self, filename='loan_predictor_model.pkl'):
-        """Load a trained model"""
-        model_data = joblib.load(filename)
-        self.best_model = model_data['best_model']
+    def load_model(self, filename='loan_predictor_model.pkl', mmap_mode=None, lazy=True):
+        """Load a trained model
+        
+        mmap_mode is passed to joblib.load so numeric arrays are memory-mapped
+        instead of copied (e.g. 'r'). For directories written with
+        save_model(..., mmap=True) the estimator is loaded on first use
+        unless lazy=False; it is memory-mapped read-only by default. A file
+        written by save_pipeline is adopted through use_pipeline.
+        """
+        if os.path.isdir(filename):
+            with open(os.path.join(filename, MANIFEST_FILE)) as f:
+                manifest = json.load(f)
+            if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+                raise ValueError(f"Unsupported model format version: {manifest.get('format_version')}")
+            
+            model_data = joblib.load(os.path.join(filename, manifest['preprocessing_file']))
+            model_path = os.path.join(filename, manifest['model_file'])
+            self.best_model = None
+            self._lazy_model = (manifest['model_name'], model_path, mmap_mode or 'r')
+            if manifest.get('compiled_trees'):
+                self._compiled_trees_path = os.path.join(filename, manifest['compiled_trees'])
+            if not lazy:
+                # Accessing the property performs the deferred load now
+                self.best_model
+        else:
+            model_data = joblib.load(filename, mmap_mode=mmap_mode)
+            if isinstance(model_data, Pipeline):
+                # Written by save_pipeline
+                self.use_pipeline(model_data)
+                print(f"Model loaded from {filename}")
+                return
+            self.best_model = model_data['best_model']
+        
         self.label_encoders = model_data['label_encoders']
         self.scaler = model_data['scaler']
         self.feature_columns = model_data['feature_columns']
+        self.imputation_values = model_data.get('imputation_values', {})
+        self.compiled_inference = None
+        self.compiled_trees = None
         print(f"Model loaded from {filename}")
 
 def main():
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+"""
+scikit-learn Pipeline export
+
+Wraps the predictor's imputation, derived features and categorical encoding
+in a transformer so the whole chain (features -> optional scaler -> model)
+is one sklearn Pipeline. Pipelines work with cross_val_score, GridSearchCV
+and Pipeline(memory=...) caching, and a fitted one can be persisted with
+joblib and used without LoanPredictor.
+"""
+
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+FEATURES_STEP = 'features'
+SCALER_STEP = 'scaler'
+
+
+class LoanFeatureTransformer(TransformerMixin, BaseEstimator):
+    """Raw applicant frame -> encoded feature frame in training column order
+
+    fit learns the imputation values, label encoders and feature columns
+    exactly like LoanPredictor.transform(df, fit=True); transform applies
+    them like predict_batch does. A Loan_Status column in X is ignored.
+    """
+
+    def __init__(self, compact=False):
+        self.compact = compact
+
+    def _predictor(self):
+        # Local import avoids a circular import at module load
+        from .loan_predictor import LoanPredictor
+        predictor = LoanPredictor(compact=self.compact)
+        if hasattr(self, 'feature_columns_'):
+            predictor.imputation_values = self.imputation_values_
+            predictor.label_encoders = self.label_encoders_
+            predictor.feature_columns = self.feature_columns_
+        return predictor
+
+    def fit(self, X, y=None):
+        predictor = self._predictor()
+        encoded = predictor.transform(X, fit=True)
+        self.imputation_values_ = predictor.imputation_values
+        self.label_encoders_ = predictor.label_encoders
+        self.feature_columns_ = [col for col in encoded.columns if col != 'Loan_Status']
+        return self
+
+    def transform(self, X):
+        if not hasattr(self, 'feature_columns_'):
+            raise ValueError("LoanFeatureTransformer is not fitted yet")
+        return self._predictor()._prepare_features(X)
+
+    def get_feature_names_out(self, input_features=None):
+        return list(self.feature_columns_)
+
+
+def build_pipeline(name, model, scaled=False, memory=None, compact=False):
+    """Unfitted features -> (scaler) -> model pipeline; the last step is named after the model
+
+    memory is passed to Pipeline so fitted transformers are cached (a path
+    or joblib.Memory) and reused across candidate models on the same data.
+    """
+    return Pipeline([
+        (FEATURES_STEP, LoanFeatureTransformer(compact=compact)),
+        (SCALER_STEP, StandardScaler() if scaled else 'passthrough'),
+        (name, model)
+    ], memory=memory)
+
+
+def pipeline_from_predictor(predictor, scaled):
+    """Assemble a fitted pipeline from a trained predictor's state without refitting"""
+    name, model = predictor.best_model
+    features = LoanFeatureTransformer(compact=predictor.compact)
+    features.imputation_values_ = predictor.imputation_values
+    features.label_encoders_ = predictor.label_encoders
+    features.feature_columns_ = list(predictor.feature_columns)
+    return Pipeline([
+        (FEATURES_STEP, features),
+        (SCALER_STEP, predictor.scaler if scaled else 'passthrough'),
+        (name, model)
+    ])
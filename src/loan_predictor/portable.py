@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+"""
+Portable model export and NumPy-only runtime
+
+export_portable writes a trained LoanPredictor's fitted preprocessing
+(category classes, imputation values, scaler statistics) and its best
+model to a directory of JSON and .npy files. PortableModel loads that
+directory and scores applicants with nothing but NumPy: no pandas, no
+scikit-learn and no pickles, so scoring processes start fast and stay
+small.
+
+Supported best models are logistic, sgd_logistic (log loss), RBF svm with
+probability=True, svm_approx (sigmoid-calibrated Nystroem + linear SVM),
+random_forest and gradient_boosting; probabilities match the scikit-learn
+estimators to floating-point precision.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from .inference import CompiledInference
+from .tree_compiler import CompiledTreeEnsemble
+
+PORTABLE_FORMAT_VERSION = 1
+PORTABLE_MANIFEST = 'portable.json'
+PORTABLE_TREES = 'trees'
+
+# libsvm's pairwise coupling bounds and stopping rule (multiclass_probability, k=2)
+_SVM_MIN_PROB = 1e-7
+_SVM_COUPLING_EPS = 0.005 / 2
+_SVM_COUPLING_ITERATIONS = 100
+
+
+def _plain(value):
+    """value with NumPy scalars replaced by Python ones, for JSON"""
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _rbf_kernel(X, points, gamma):
+    distances = (X * X).sum(axis=1)[:, np.newaxis] - 2 * X @ points.T + (points * points).sum(axis=1)
+    return np.exp(-gamma * np.maximum(distances, 0))
+
+
+def _kernel_approximation_arrays(name, model):
+    """Arrays of each calibrated (Nystroem, linear SVM, sigmoid) fold of a CalibratedClassifierCV"""
+    if model.method != 'sigmoid':
+        raise ValueError(f"{name}: only sigmoid-calibrated kernel approximations can be exported")
+    params = {'gamma': [], 'sigmoid': []}
+    arrays = {}
+    for i, calibrated in enumerate(model.calibrated_classifiers_):
+        steps = getattr(calibrated.estimator, 'named_steps', {})
+        kernel, linear = steps.get('kernel'), steps.get('linear')
+        if type(kernel).__name__ != 'Nystroem' or kernel.kernel != 'rbf' or not hasattr(linear, 'coef_'):
+            raise ValueError(f"{name}: only RBF Nystroem + linear model pipelines can be exported")
+        params['gamma'].append(float(kernel.gamma if kernel.gamma is not None else 1.0 / kernel.n_features_in_))
+        calibrator, = calibrated.calibrators
+        params['sigmoid'].append([float(calibrator.a_), float(calibrator.b_)])
+        # Folding the normalization into the weights leaves one kernel row product per fold
+        arrays.update({
+            f'components_{i}': kernel.components_,
+            f'weights_{i}': kernel.normalization_.T @ linear.coef_.ravel(),
+            f'intercept_{i}': linear.intercept_
+        })
+    return 'kernel_approximation', params, arrays
+
+
+def _model_arrays(name, model):
+    """(kind, params, arrays) describing a fitted estimator without sklearn"""
+    estimator = type(model).__name__
+    if estimator in ('LogisticRegression', 'SGDClassifier'):
+        if getattr(model, 'loss', 'log_loss') != 'log_loss':
+            raise ValueError(f"{name}: only log-loss linear models have probabilities to export")
+        return 'linear', {}, {'coef': model.coef_.ravel(), 'intercept': model.intercept_}
+    if estimator == 'SVC':
+        if model.kernel != 'rbf' or not getattr(model, 'probability', False):
+            raise ValueError(f"{name}: only RBF SVC models with probability=True can be exported")
+        params = {'gamma': float(model._gamma), 'prob_a': float(model.probA_[0]), 'prob_b': float(model.probB_[0])}
+        arrays = {'support_vectors': model.support_vectors_, 'dual_coef': model.dual_coef_.ravel(),
+                  'intercept': model.intercept_}
+        return 'svm', params, arrays
+    if estimator == 'CalibratedClassifierCV':
+        return _kernel_approximation_arrays(name, model)
+    if estimator in ('RandomForestClassifier', 'GradientBoostingClassifier'):
+        return 'trees', {}, {}
+    raise ValueError(f"Cannot export a {estimator} model ({name}) to the portable format")
+
+
+def export_portable(predictor, directory):
+    """Write predictor's preprocessing and best model to directory; returns the manifest
+
+    The manifest is written last, so a partially written directory never
+    loads.
+    """
+    # Local import avoids a circular import at module load
+    from .loan_predictor import SCALED_MODELS
+    if predictor.best_model_name is None:
+        raise ValueError("Model not trained yet. Call train_models() first.")
+
+    name, model = predictor.best_model
+    kind, params, arrays = _model_arrays(name, model)
+    scaled = name in SCALED_MODELS
+    if scaled:
+        arrays.update(scaler_mean=predictor.scaler.mean_, scaler_scale=predictor.scaler.scale_)
+
+    os.makedirs(directory, exist_ok=True)
+    for array_name, values in arrays.items():
+        np.save(os.path.join(directory, f'{array_name}.npy'), np.asarray(values, dtype=np.float64),
+                allow_pickle=False)
+    if kind == 'trees':
+        CompiledTreeEnsemble.from_estimator(model).save(os.path.join(directory, PORTABLE_TREES))
+
+    manifest = {
+        'format_version': PORTABLE_FORMAT_VERSION,
+        'model_name': name,
+        'model_kind': kind,
+        'scaled': scaled,
+        'classes': _plain(model.classes_.tolist()),
+        'feature_columns': list(predictor.feature_columns),
+        'categories': {col: _plain(encoder.classes_.tolist()) for col, encoder in predictor.label_encoders.items()},
+        'imputation_values': _plain(predictor.imputation_values),
+        'params': params,
+        'arrays': sorted(arrays)
+    }
+    with open(os.path.join(directory, PORTABLE_MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _svm_coupled_probabilities(r):
+    """libsvm's pairwise coupling for two classes, where r is P(first class) from the sigmoid
+
+    libsvm stops iterating at a tolerance, so the result is not simply r;
+    every row runs the same updates until it converges.
+    """
+    r = np.clip(r, _SVM_MIN_PROB, 1 - _SVM_MIN_PROB)
+    q = np.empty((len(r), 2, 2))
+    q[:, 0, 0] = (1 - r) * (1 - r)
+    q[:, 1, 1] = r * r
+    q[:, 0, 1] = q[:, 1, 0] = -(1 - r) * r
+    p = np.full((len(r), 2), 0.5)
+    active = np.ones(len(r), dtype=bool)
+    for _ in range(_SVM_COUPLING_ITERATIONS):
+        qp = np.einsum('nij,nj->ni', q, p)
+        pqp = (p * qp).sum(axis=1)
+        active &= np.abs(qp - pqp[:, np.newaxis]).max(axis=1) >= _SVM_COUPLING_EPS
+        if not active.any():
+            break
+        for t in range(2):
+            diff = np.where(active, (pqp - qp[:, t]) / q[:, t, t], 0.0)
+            p[:, t] += diff
+            pqp = (pqp + diff * (diff * q[:, t, t] + 2 * qp[:, t])) / (1 + diff) / (1 + diff)
+            for j in range(2):
+                qp[:, j] = (qp[:, j] + diff * q[:, t, j]) / (1 + diff)
+                p[:, j] /= 1 + diff
+    return p
+
+
+class PortableModel:
+    """Scores applicant dicts from an export_portable directory using only NumPy"""
+
+    def __init__(self, manifest, arrays, trees=None):
+        self.model_name = manifest['model_name']
+        self.kind = manifest['model_kind']
+        self.scaled = manifest['scaled']
+        self.classes = np.asarray(manifest['classes'])
+        self.params = manifest['params']
+        self.arrays = arrays
+        self.trees = trees
+        self.inference = CompiledInference.from_tables(
+            manifest['feature_columns'], manifest['categories'],
+            arrays.get('scaler_mean'), arrays.get('scaler_scale'), manifest['imputation_values']
+        )
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+        """Load an exported model, optionally memory-mapping its arrays"""
+        with open(os.path.join(directory, PORTABLE_MANIFEST)) as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != PORTABLE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported portable format version: {manifest.get('format_version')}")
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in manifest['arrays']
+        }
+        trees = None
+        if manifest['model_kind'] == 'trees':
+            trees = CompiledTreeEnsemble.load(os.path.join(directory, PORTABLE_TREES), mmap_mode=mmap_mode)
+        return cls(manifest, arrays, trees)
+
+    def vectorize(self, applicants):
+        """Model-ready (and, if needed, scaled) feature matrix for a list of applicant dicts
+
+        Raises ValueError for applicants the exported tables cannot
+        represent, e.g. unseen categories or non-numeric amounts.
+        """
+        X = np.empty((len(applicants), self.inference.n_features))
+        for i, applicant in enumerate(applicants):
+            row = self.inference.vectorize(applicant, scale=self.scaled)
+            if row is None:
+                raise ValueError(f"Applicant {i} cannot be scored by the portable model")
+            X[i] = row[0]
+        return X
+
+    def _decision_function(self, X):
+        if self.kind == 'linear':
+            return X @ self.arrays['coef'] + self.arrays['intercept'][0]
+        kernel = _rbf_kernel(X, self.arrays['support_vectors'], self.params['gamma'])
+        return kernel @ self.arrays['dual_coef'] + self.arrays['intercept'][0]
+
+    def _calibrated_kernel_approximation(self, X):
+        """P(second class) averaged over the calibrated folds, like CalibratedClassifierCV"""
+        positive = np.zeros(len(X))
+        for i, (gamma, (a, b)) in enumerate(zip(self.params['gamma'], self.params['sigmoid'])):
+            kernel = _rbf_kernel(X, self.arrays[f'components_{i}'], gamma)
+            decision = kernel @ self.arrays[f'weights_{i}'] + self.arrays[f'intercept_{i}'][0]
+            positive += 1.0 / (1.0 + np.exp(a * decision + b))
+        return positive / len(self.params['gamma'])
+
+    def predict_proba(self, X):
+        """Class probabilities for a vectorized matrix, in the order of self.classes"""
+        if self.kind == 'trees':
+            return self.trees.predict_proba(X)
+        if self.kind == 'kernel_approximation':
+            positive = self._calibrated_kernel_approximation(X)
+            return np.column_stack([1.0 - positive, positive])
+        decision = self._decision_function(X)
+        if self.kind == 'linear':
+            positive = 1.0 / (1.0 + np.exp(-decision))
+            return np.column_stack([1.0 - positive, positive])
+        # libsvm's decision values have the opposite sign for the first class
+        f_apb = -decision * self.params['prob_a'] + self.params['prob_b']
+        first = np.where(f_apb >= 0, np.exp(-np.abs(f_apb)) / (1.0 + np.exp(-np.abs(f_apb))),
+                         1.0 / (1.0 + np.exp(-np.abs(f_apb))))
+        return _svm_coupled_probabilities(first)
+
+    def _predict_arrays(self, X):
+        probabilities = self.predict_proba(X)
+        if self.kind == 'svm':
+            # Like SVC.predict, the label follows the decision function, not the probabilities
+            predictions = self.classes.take((self._decision_function(X) > 0).astype(int))
+        else:
+            predictions = self.classes.take(np.argmax(probabilities, axis=1))
+        return predictions, probabilities
+
+    def predict_loan(self, applicant_data):
+        """Same result as LoanPredictor.predict_loan for one applicant"""
+        predictions, probabilities = self._predict_arrays(self.vectorize([applicant_data]))
+        return {
+            'approved': bool(predictions[0]),
+            'probability': float(probabilities[0, 1]),
+            'model_used': self.model_name
+        }
+
+    def predict_batch(self, applicants):
+        """Results for a list of applicant dicts, in predict_loan's format"""
+        if not applicants:
+            return []
+        predictions, probabilities = self._predict_arrays(self.vectorize(applicants))
+        return [
+            {'approved': bool(prediction), 'probability': float(probability), 'model_used': self.model_name}
+            for prediction, probability in zip(predictions, probabilities[:, 1])
+        ]
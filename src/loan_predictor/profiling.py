@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+"""
+Profiling hooks
+
+LoanPredictor reports each stage of training and prediction as an event
+dict to the callables in its profiling_hooks list. An event holds the stage
+name, its wall time in seconds and, while tracemalloc is tracing, the
+change in traced memory and the peak reached above the starting level
+(process-wide figures, so concurrent stages inflate each other). Stage
+specific context such as the model name or the number of rows is added as
+extra keys. ProfileRecorder is a hook that aggregates events per stage.
+
+SamplingProfiler samples the Python stacks of threads that are inside a
+prediction for a given number of requests and writes them in the collapsed
+stack format read by flamegraph.pl, speedscope and similar tools.
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# Open spans per thread, so a nested stage does not hide its parent's memory peak
+_open_spans = threading.local()
+
+
+class StageSpan:
+    """Context manager timing one stage and passing the event to emit(event)"""
+
+    __slots__ = ('stage', 'emit', 'context', 'start', 'memory_start', 'peak')
+
+    def __init__(self, stage, emit, context=None):
+        self.stage = stage
+        self.emit = emit
+        self.context = context
+
+    def __enter__(self):
+        self.memory_start = None
+        if tracemalloc.is_tracing():
+            stack = _open_spans.__dict__.setdefault('stack', [])
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.peak = current
+            stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        event = {'stage': self.stage, 'seconds': seconds, 'memory_delta': None, 'memory_peak': None}
+        if self.memory_start is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(self.peak, peak)
+            stack = _open_spans.stack
+            stack.remove(self)
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            event['memory_delta'] = current - self.memory_start
+            event['memory_peak'] = peak - self.memory_start
+        if self.context:
+            event.update(self.context)
+        self.emit(event)
+        return False
+
+
+class ProfileRecorder:
+    """Profiling hook aggregating events by stage (and model, for per-model stages)
+
+    keep_events=True also keeps every raw event in self.events.
+    """
+
+    def __init__(self, keep_events=False):
+        self.keep_events = keep_events
+        self.events = []
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stage_key(event):
+        model = event.get('model')
+        return f"{event['stage']}[{model}]" if model is not None else event['stage']
+
+    def __call__(self, event):
+        key = self.stage_key(event)
+        with self._lock:
+            if self.keep_events:
+                self.events.append(event)
+            stats = self.stages.get(key)
+            if stats is None:
+                stats = self.stages[key] = {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+                                            'max_memory_peak': None, 'total_memory_delta': None}
+            stats['count'] += 1
+            stats['total_seconds'] += event['seconds']
+            stats['max_seconds'] = max(stats['max_seconds'], event['seconds'])
+            if event['memory_peak'] is not None:
+                stats['max_memory_peak'] = max(stats['max_memory_peak'] or 0, event['memory_peak'])
+                stats['total_memory_delta'] = (stats['total_memory_delta'] or 0) + event['memory_delta']
+
+    def summary(self):
+        """{stage: {'count', 'total_seconds', 'mean_seconds', 'max_seconds', 'max_memory_peak',
+        'total_memory_delta'}} in the order stages were first seen"""
+        with self._lock:
+            return {
+                key: dict(stats, mean_seconds=stats['total_seconds'] / stats['count'])
+                for key, stats in self.stages.items()
+            }
+
+    def report(self):
+        """The summary as a fixed-width text table"""
+        lines = [f"{'stage':<32} {'count':>7} {'total s':>10} {'mean ms':>10} {'max ms':>10} {'peak MB':>9}"]
+        for key, stats in self.summary().items():
+            peak = stats['max_memory_peak']
+            peak = f"{peak / 1e6:9.2f}" if peak is not None else f"{'-':>9}"
+            lines.append(f"{key:<32} {stats['count']:>7} {stats['total_seconds']:>10.4f} "
+                         f"{stats['mean_seconds'] * 1000:>10.3f} {stats['max_seconds'] * 1000:>10.3f} {peak}")
+        return '\n'.join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.events = []
+            self.stages = {}
+
+
+def _collapse(frame):
+    """One stack as 'outermost;...;innermost' with 'function (file:line)' frames"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        name = getattr(code, 'co_qualname', code.co_name)
+        names.append(f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':'))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class SamplingProfiler:
+    """Sample the stacks of threads inside request() every interval seconds
+
+    After n_requests requests have finished the samples are written to
+    path as collapsed stacks ('frame;frame;frame count' per line) and
+    sampling stops. stop() ends it early and writes what was collected.
+    """
+
+    def __init__(self, path, n_requests, interval=0.001):
+        if n_requests < 1:
+            raise ValueError("n_requests must be at least 1")
+        self.path = path
+        self.n_requests = n_requests
+        self.interval = interval
+        self.counts = Counter()
+        self.requests = 0
+        self.samples = 0
+        self.finished = False
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    @contextlib.contextmanager
+    def request(self):
+        """Sample the calling thread for the duration of one request"""
+        ident = threading.get_ident()
+        with self._lock:
+            sampling = not self.finished
+            if sampling:
+                if self._sampler is None:
+                    self._sampler = threading.Thread(target=self._sample, daemon=True)
+                    self._sampler.start()
+                self._active[ident] = self._active.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            if sampling:
+                self._end_request(ident)
+
+    def _end_request(self, ident):
+        with self._lock:
+            # stop() may have cleared the active threads already
+            depth = self._active.pop(ident, 1) - 1
+            if depth:
+                # Nested request on the same thread; only the outermost one counts
+                self._active[ident] = depth
+                return
+            self.requests += 1
+            done = self.requests >= self.n_requests and not self.finished
+            if done:
+                self.finished = True
+        if done:
+            self._finish()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                idents = list(self._active)
+            if not idents:
+                continue
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.counts[_collapse(frame)] += 1
+                    self.samples += 1
+
+    def _finish(self):
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.dump()
+
+    def stop(self):
+        """Stop sampling now and write the samples collected so far"""
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+            self._active.clear()
+        self._finish()
+
+    def dump(self, path=None):
+        """Write the collapsed stacks to path (default self.path) and return the path"""
+        path = path or self.path
+        # Write then rename so a reader never sees a partial file
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f'{stack} {count}\n')
+        os.replace(temporary, path)
+        return path
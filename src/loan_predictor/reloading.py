@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""
+Hot model reloading
+
+Loads a new model bundle off the request path, validates it and hands it
+to a swap callback only if validation passes, so a serving process can
+pick up a retrained model without restarting. Reloads are serialized; a
+failed load or validation leaves the current model in place.
+"""
+
+import os
+import threading
+import time
+
+from .artifacts import MANIFEST_FILE
+
+
+def bundle_signature(path):
+    """Identify the current version of a bundle on disk, or None if it does not exist
+
+    Directory bundles are identified by their manifest, which save_model
+    writes last, so a partially written directory is never picked up.
+    """
+    target = os.path.join(path, MANIFEST_FILE) if os.path.isdir(path) else path
+    try:
+        stat = os.stat(target)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class ModelReloader:
+    """Load -> validate -> swap, on demand or when the bundle changes on disk
+
+    load_fn(path) returns a ready predictor, validate_fn(predictor) raises
+    if it must not serve traffic and swap_fn(predictor) installs it.
+    """
+
+    def __init__(self, load_fn, validate_fn, swap_fn, clock=time.time):
+        self.load_fn = load_fn
+        self.validate_fn = validate_fn
+        self.swap_fn = swap_fn
+        self.clock = clock
+        self.reloads = 0
+        self.failures = 0
+        self.state = 'idle'
+        self.last_error = None
+        self.last_loaded_at = None
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def reload(self, path):
+        """Load, validate and swap in the bundle at path; return True if it was swapped in"""
+        with self._reload_lock:
+            self.state = 'loading'
+            try:
+                candidate = self.load_fn(path)
+                self.validate_fn(candidate)
+            except Exception as e:
+                self.failures += 1
+                self.state = 'failed'
+                self.last_error = f"{type(e).__name__}: {e}"
+                return False
+            self.swap_fn(candidate)
+            self.reloads += 1
+            self.state = 'loaded'
+            self.last_error = None
+            self.last_loaded_at = self.clock()
+            return True
+
+    def reload_in_background(self, path):
+        """Start reload(path) on a daemon thread; return False if a reload is already running"""
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self.reload, args=(path,), daemon=True).start()
+        return True
+
+    def watch(self, path, interval=5.0):
+        """Poll path every interval seconds and reload when its signature changes"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(path, interval), daemon=True)
+        self._watcher.start()
+
+    def stop(self):
+        """Stop the watcher thread"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, path, interval):
+        seen = bundle_signature(path)
+        while not self._stop.wait(interval):
+            signature = bundle_signature(path)
+            # A failed attempt is not retried until the bundle changes again
+            if signature is not None and signature != seen:
+                seen = signature
+                self.reload(path)
+
+    def status(self):
+        """Counters and outcome of the most recent reload"""
+        return {
+            'state': self.state,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_error': self.last_error,
+            'last_loaded_at': self.last_loaded_at,
+            'watching': self._watcher is not None and self._watcher.is_alive()
+        }
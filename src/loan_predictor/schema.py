@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Applicant request schema
+
+APPLICANT_SCHEMA declares every field of an /api/predict payload: the model
+column it feeds, the accepted values and the unit conversion. compile_schema
+turns it once into an ApplicantSchema whose convert() checks and converts a
+payload in a single pass, returning the model-ready row, the values echoed
+back to the client and every field error at once.
+"""
+
+import math
+
+# Request field -> spec. 'category' fields accept the listed values (a dict
+# maps each accepted value to the model value); 'number' fields accept
+# numbers or numeric strings and are divided by 'divisor' for the model.
+# Number fields may also set 'min', 'allowed' (a list of values) and
+# 'aliases' (strings accepted in place of a number; such fields echo the
+# value as sent). The applicant schema only requires what the model can
+# score: categories it was trained on and finite numbers.
+APPLICANT_SCHEMA = {
+    'gender': {'column': 'Gender', 'type': 'category', 'choices': ['Male', 'Female']},
+    'married': {'column': 'Married', 'type': 'category', 'choices': ['Yes', 'No']},
+    # The form's '3+' option counts as 3
+    'dependents': {'column': 'Dependents', 'type': 'number', 'aliases': {'3+': 3.0}},
+    'education': {'column': 'Education', 'type': 'category', 'choices': ['Graduate', 'Not Graduate']},
+    'self_employed': {'column': 'Self_Employed', 'type': 'category', 'choices': ['Yes', 'No']},
+    # Annual incomes in dollars; the model was trained on monthly incomes
+    'applicant_income': {'column': 'ApplicantIncome', 'type': 'number', 'divisor': 12},
+    'coapplicant_income': {'column': 'CoapplicantIncome', 'type': 'number', 'divisor': 12},
+    # Full dollars; the model was trained on thousands
+    'loan_amount': {'column': 'LoanAmount', 'type': 'number', 'divisor': 1000},
+    'loan_amount_term': {'column': 'Loan_Amount_Term', 'type': 'number'},
+    'credit_history': {'column': 'Credit_History', 'type': 'number'},
+    'property_area': {'column': 'Property_Area', 'type': 'category', 'choices': ['Urban', 'Semiurban', 'Rural']}
+}
+
+
+def _category_converter(choices):
+    """convert(raw) -> (display, model) for a category field"""
+    mapping = dict(choices) if isinstance(choices, dict) else {choice: choice for choice in choices}
+    message = f"must be one of {list(mapping)}"
+
+    def convert(raw):
+        if isinstance(raw, bool) or raw is None:
+            raise ValueError(message)
+        # str() also accepts JSON numbers such as 2 for '2'
+        value = mapping.get(raw if isinstance(raw, str) else str(raw))
+        if value is None:
+            raise ValueError(message)
+        return raw, value
+    return convert
+
+
+def _number_converter(minimum=None, allowed=None, divisor=None, aliases=None):
+    """convert(raw) -> (display, model) for a number field"""
+    allowed = None if allowed is None else frozenset(float(value) for value in allowed)
+
+    def convert(raw):
+        if isinstance(raw, bool) or raw is None:
+            raise ValueError("must be a number")
+        if aliases and isinstance(raw, str) and raw in aliases:
+            value = float(aliases[raw])
+        else:
+            try:
+                value = float(raw)
+            except (TypeError, ValueError, OverflowError):
+                raise ValueError("must be a number") from None
+        if not math.isfinite(value):
+            raise ValueError("must be a finite number")
+        if minimum is not None and value < minimum:
+            raise ValueError(f"must be at least {minimum}")
+        if allowed is not None and value not in allowed:
+            raise ValueError(f"must be one of {sorted(allowed)}")
+        return (raw if aliases else value), (value / divisor if divisor else value)
+    return convert
+
+
+class ApplicantSchema:
+    """A compiled schema; see compile_schema"""
+
+    def __init__(self, fields):
+        # (request field, model column, converter) in schema order
+        self.fields = fields
+        self.required = [name for name, _, _ in fields]
+
+    def convert(self, data):
+        """Return (applicant, display, errors) for one payload
+
+        applicant is keyed by model column in model units and display echoes
+        the submitted values by model column; both are only complete when
+        errors, a {field: message} dict, is empty.
+        """
+        if not isinstance(data, dict):
+            return {}, {}, {'_': 'Expected a JSON object'}
+        applicant, display, errors = {}, {}, {}
+        for name, column, convert in self.fields:
+            try:
+                raw = data[name]
+            except KeyError:
+                errors[name] = 'required'
+                continue
+            try:
+                display[column], applicant[column] = convert(raw)
+            except ValueError as e:
+                errors[name] = str(e)
+        return applicant, display, errors
+
+
+def compile_schema(schema=APPLICANT_SCHEMA):
+    """Build the per-field converters of schema once, for reuse by every request"""
+    fields = []
+    for name, spec in schema.items():
+        if spec['type'] == 'category':
+            convert = _category_converter(spec['choices'])
+        elif spec['type'] == 'number':
+            convert = _number_converter(spec.get('min'), spec.get('allowed'), spec.get('divisor'),
+                                        spec.get('aliases'))
+        else:
+            raise ValueError(f"Unknown field type for {name}: {spec['type']}")
+        fields.append((name, spec['column'], convert))
+    return ApplicantSchema(fields)
+
+
+def format_errors(errors):
+    """One error message for a {field: message} dict, listing missing fields first"""
+    if '_' in errors:
+        return errors['_']
+    missing = [name for name, message in errors.items() if message == 'required']
+    invalid = [f"{name} {message}" for name, message in errors.items() if message != 'required']
+    parts = []
+    if missing:
+        parts.append(f"Missing required fields: {missing}")
+    if invalid:
+        parts.append(f"Invalid fields: {'; '.join(invalid)}")
+    return '. '.join(parts)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+"""
+Bulk scoring of applicant files
+
+Reads a CSV, JSON-lines or Parquet file of applicants chunk by chunk,
+scores the chunks in a pool of worker processes that each load the model
+bundle once, and appends the results to an output file in input order.
+At most max_in_flight chunks are queued or being scored at any time, so
+memory stays bounded however large the input is.
+
+Usage:
+    python run_score.py applications.csv scores.csv --model loan_predictor_model.pkl --workers 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .loan_predictor import LoanPredictor
+from .streaming import ChunkWriter, iter_chunks
+
+# Input columns copied to the output when present, to join scores back to applications
+DEFAULT_KEEP_COLUMNS = ['Loan_ID']
+
+# Model of the current worker process, loaded once by _init_worker
+_worker_predictor = None
+
+
+def load_scoring_model(model_path):
+    """Load a bundle for batch scoring; numeric arrays are memory-mapped where the format allows"""
+    predictor = LoanPredictor()
+    predictor.load_model(model_path, mmap_mode='r')
+    return predictor
+
+
+def _init_worker(model_path):
+    global _worker_predictor
+    _worker_predictor = load_scoring_model(model_path)
+
+
+def score_chunk(predictor, chunk, keep_columns=()):
+    """Score one chunk; returns the kept columns followed by 'approved' and 'probability'"""
+    results = predictor.predict_batch(chunk)
+    scored = chunk[[col for col in keep_columns if col in chunk.columns]].copy()
+    scored['approved'] = results['approved'].to_numpy()
+    scored['probability'] = results['probability'].to_numpy()
+    return scored
+
+
+def _score_in_worker(chunk, keep_columns):
+    return score_chunk(_worker_predictor, chunk, keep_columns)
+
+
+def score_file(model_path, source, output, chunksize=50000, workers=None, max_in_flight=None,
+               keep_columns=DEFAULT_KEEP_COLUMNS, progress=None):
+    """Score every applicant in source and write the results to output
+
+    workers is the number of scoring processes (default: one per CPU);
+    workers=1 scores in this process. max_in_flight bounds the chunks
+    submitted but not yet written (default: 2 per worker). progress, if
+    given, is called as progress(rows, seconds) after each chunk is
+    written. Each output row also has a 'row' column with its position in
+    the input.
+
+    Returns {'rows', 'chunks', 'seconds', 'rows_per_second'}.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+    keep_columns = list(keep_columns)
+    start = time.perf_counter()
+    rows = chunks = 0
+
+    def write(writer, scored):
+        nonlocal rows, chunks
+        scored.insert(0, 'row', pd.RangeIndex(rows, rows + len(scored)))
+        writer.write(scored)
+        rows += len(scored)
+        chunks += 1
+        if progress is not None:
+            progress(rows, time.perf_counter() - start)
+
+    with ChunkWriter(output) as writer:
+        if workers == 1:
+            predictor = load_scoring_model(model_path)
+            for chunk in iter_chunks(source, chunksize):
+                if len(chunk):
+                    write(writer, score_chunk(predictor, chunk, keep_columns))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+                # Results are written in submission order; a full window waits for the oldest chunk
+                pending = deque()
+                for chunk in iter_chunks(source, chunksize):
+                    if not len(chunk):
+                        continue
+                    if len(pending) >= max_in_flight:
+                        write(writer, pending.popleft().result())
+                    pending.append(pool.submit(_score_in_worker, chunk, keep_columns))
+                    del chunk
+                while pending:
+                    write(writer, pending.popleft().result())
+
+    seconds = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'chunks': chunks,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a file of loan applications in parallel")
+    parser.add_argument('source', help='input file (.csv, .jsonl or .parquet)')
+    parser.add_argument('output', help='output file (.csv, .jsonl or .parquet)')
+    parser.add_argument('--model', default='loan_predictor_model.pkl',
+                        help='model bundle written by save_model (default: %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='rows per chunk (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None, help='scoring processes (default: one per CPU)')
+    parser.add_argument('--max-in-flight', type=int, default=None,
+                        help='chunks queued or being scored at once (default: 2 per worker)')
+    parser.add_argument('--keep', default=','.join(DEFAULT_KEEP_COLUMNS),
+                        help='comma-separated input columns copied to the output (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    def report(rows, seconds):
+        rate = rows / seconds if seconds > 0 else 0.0
+        print(f"\r{rows:,} rows scored ({rate:,.0f} rows/s)", end='', file=sys.stderr, flush=True)
+
+    summary = score_file(args.model, args.source, args.output, args.chunk_size, args.workers,
+                         args.max_in_flight, [col for col in args.keep.split(',') if col], report)
+    print(file=sys.stderr)
+    print(f"Scored {summary['rows']:,} rows in {summary['seconds']:.1f}s "
+          f"({summary['rows_per_second']:,.0f} rows/s) -> {args.output}")
+    return summary
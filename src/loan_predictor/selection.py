@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""
+Cross-validated model selection
+
+Runs stratified k-fold cross-validation over a dict of candidate models with
+the (model, fold) fits spread across cores, optionally pruning clearly
+losing candidates successive-halving style after the first few folds.
+"""
+
+import math
+import time
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+
+def score_fold(name, model, X, y, train_idx, test_idx, scale):
+    """Fit a fresh copy of model on one fold and return its accuracy and fit time"""
+    X_train, X_test = X[train_idx], X[test_idx]
+    if scale:
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+        X_test = scaler.transform(X_test)
+
+    model = clone(model)
+    start = time.perf_counter()
+    model.fit(X_train, y[train_idx])
+    fit_time = time.perf_counter() - start
+
+    accuracy = accuracy_score(y[test_idx], model.predict(X_test))
+    return name, accuracy, fit_time
+
+
+def cross_validate_models(models, X, y, scaled_models=(), n_splits=5, n_jobs=None,
+                          backend=None, prune=True, min_folds=2, eta=2, random_state=42):
+    """Cross-validate every candidate in models and return per-model results
+
+    With prune=True every candidate is first scored on min_folds folds; after
+    each round only the best ceil(n / eta) candidates are kept and the fold
+    budget is multiplied by eta, until all n_splits folds are used. Models in
+    scaled_models are standardized with a scaler fitted on each training fold.
+
+    Returns {name: {'mean_accuracy', 'std_accuracy', 'scores', 'fit_time',
+    'pruned'}} in the order of models.
+    """
+    if prune and eta <= 1:
+        raise ValueError("eta must be greater than 1 when pruning")
+
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    folds = list(cv.split(X, y))
+
+    scores = {name: [] for name in models}
+    fit_times = {name: 0.0 for name in models}
+    pruned = set()
+
+    candidates = list(models)
+    done = 0
+    budget = min(min_folds, n_splits) if prune else n_splits
+    while True:
+        outcomes = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(score_fold)(name, models[name], X, y, *folds[i], name in scaled_models)
+            for name in candidates
+            for i in range(done, budget)
+        )
+        for name, accuracy, fit_time in outcomes:
+            scores[name].append(accuracy)
+            fit_times[name] += fit_time
+        done = budget
+
+        if done >= n_splits:
+            break
+
+        if prune and len(candidates) > 1:
+            # Stable sort keeps the models order among equal scores
+            ranked = sorted(candidates, key=lambda name: -np.mean(scores[name]))
+            survivors = set(ranked[:max(1, math.ceil(len(candidates) / eta))])
+            pruned.update(name for name in candidates if name not in survivors)
+            candidates = [name for name in candidates if name in survivors]
+            print(f"Pruned after {done} folds: {sorted(pruned)}")
+        budget = min(int(math.ceil(budget * eta)), n_splits)
+
+    return {
+        name: {
+            'mean_accuracy': float(np.mean(scores[name])),
+            'std_accuracy': float(np.std(scores[name])),
+            'scores': np.array(scores[name]),
+            'fit_time': fit_times[name],
+            'pruned': name in pruned
+        }
+        for name in models
+    }
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+"""
+Out-of-core training from chunked sources
+
+Reads CSV, JSON-lines or Parquet files (or any re-iterable source of
+DataFrames) chunk by chunk and fits the predictor's imputation values,
+label encoders and StandardScaler from running statistics, then trains
+incremental models with partial_fit. Only one chunk is held in memory at
+a time; each stage is one pass over the source. ChunkWriter is the
+matching chunk-by-chunk output side.
+"""
+
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+TARGET_COLUMN = 'Loan_Status'
+
+# Every HOLDOUT_EVERY-th row (by position in the source) is held out for evaluation
+HOLDOUT_EVERY = 5
+
+
+def default_streaming_models():
+    """Candidate models that support partial_fit"""
+    # Imported here so reading and writing chunks does not load the estimators
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.naive_bayes import GaussianNB
+    return {
+        'sgd_logistic': SGDClassifier(loss='log_loss', random_state=42),
+        'naive_bayes': GaussianNB()
+    }
+
+
+def iter_chunks(source, chunksize=100000):
+    """Yield DataFrame chunks from a file path or a zero-argument callable
+
+    Paths ending in .csv, .jsonl/.json or .parquet are read incrementally
+    (Parquet requires pyarrow). A callable is called once per pass and must
+    return a fresh iterable of DataFrames.
+    """
+    if callable(source):
+        yield from source()
+        return
+
+    extension = os.path.splitext(str(source))[1].lower()
+    if extension == '.csv':
+        yield from pd.read_csv(source, chunksize=chunksize)
+    elif extension in ('.jsonl', '.json'):
+        yield from pd.read_json(source, lines=True, chunksize=chunksize)
+    elif extension == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet requires pyarrow: pip install pyarrow")
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported source format: {source}")
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a .csv, .jsonl or .parquet file
+
+    The file is replaced on open and written one chunk at a time (Parquet
+    requires pyarrow and gets one row group per chunk). Use as a context
+    manager or call close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.extension = os.path.splitext(str(path))[1].lower()
+        if self.extension not in ('.csv', '.jsonl', '.parquet'):
+            raise ValueError(f"Unsupported output format: {path}")
+        if self.extension == '.parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ImportError("Writing Parquet requires pyarrow: pip install pyarrow")
+        elif os.path.exists(path):
+            os.remove(path)
+        self.rows = 0
+        self._writer = None
+
+    def write(self, chunk):
+        if self.extension == '.csv':
+            chunk.to_csv(self.path, mode='a', header=self.rows == 0, index=False)
+        elif self.extension == '.jsonl':
+            with open(self.path, 'a') as f:
+                chunk.to_json(f, orient='records', lines=True)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class Reservoir:
+    """Fixed-size uniform sample of a stream of numbers, for approximate medians
+
+    The median is exact while fewer than size values have been seen.
+    """
+
+    def __init__(self, size=100000, seed=42):
+        self.size = size
+        self.sample = np.empty(size)
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        filled = min(self.size - self.seen, len(values)) if self.seen < self.size else 0
+        if filled > 0:
+            self.sample[self.seen:self.seen + filled] = values[:filled]
+        rest = values[filled:]
+        if len(rest):
+            # Algorithm R: the k-th value seen replaces a random slot with probability size/k
+            positions = self.seen + filled + np.arange(1, len(rest) + 1)
+            slots = self.rng.integers(0, positions)
+            keep = slots < self.size
+            self.sample[slots[keep]] = rest[keep]
+        self.seen += len(values)
+
+    def median(self):
+        if self.seen == 0:
+            return None
+        return float(np.median(self.sample[:min(self.seen, self.size)]))
+
+
+def _mode(counts):
+    """Most frequent value, smallest among ties (like pandas' mode()[0])"""
+    if not counts:
+        return None
+    best = max(counts.values())
+    return sorted(value for value, count in counts.items() if count == best)[0]
+
+
+def _is_holdout(start, n_rows):
+    """Boolean mask of held-out rows for a chunk starting at global row start"""
+    return (start + np.arange(n_rows)) % HOLDOUT_EVERY == 0
+
+
+def _training_chunks(predictor, target_encoder, source, chunksize):
+    """Yield (X, y, holdout_mask) per chunk with the fitted preprocessing applied"""
+    start = 0
+    for chunk in iter_chunks(source, chunksize):
+        df = predictor.transform(chunk, fit=False, inplace=True)
+        y = target_encoder.transform(df[TARGET_COLUMN])
+        X = df[predictor.feature_columns]
+        yield X, y, _is_holdout(start, len(df))
+        start += len(df)
+
+
+def fit_streaming_preprocessing(predictor, source, chunksize=100000, reservoir_size=100000):
+    """Fit imputation values, label encoders and scaler in three passes
+
+    Returns the LabelEncoder for the target column.
+    """
+    # Imported here so data_generation, which writes through ChunkWriter, does not load the predictor module
+    from .loan_predictor import MODE_IMPUTED_COLUMNS, MEDIAN_IMPUTED_COLUMNS, CATEGORICAL_COLUMNS
+
+    # Pass 1: raw-column modes/medians and the category sets
+    counts = {col: Counter() for col in MODE_IMPUTED_COLUMNS}
+    reservoirs = {col: Reservoir(reservoir_size) for col in MEDIAN_IMPUTED_COLUMNS}
+    categories = {col: set() for col in CATEGORICAL_COLUMNS + [TARGET_COLUMN]}
+    for chunk in iter_chunks(source, chunksize):
+        for col, counter in counts.items():
+            if col in chunk.columns:
+                counter.update(chunk[col].dropna().tolist())
+        for col, reservoir in reservoirs.items():
+            if col in chunk.columns:
+                reservoir.update(chunk[col])
+        for col, values in categories.items():
+            if col in chunk.columns:
+                values.update(chunk[col].dropna().unique().tolist())
+
+    initial = {col: _mode(counter) for col, counter in counts.items() if counter}
+    initial.update({col: r.median() for col, r in reservoirs.items() if r.seen})
+
+    # Pass 2: post-derivation medians of the numeric columns
+    numeric_reservoirs = {}
+    for chunk in iter_chunks(source, chunksize):
+        df = predictor._add_derived_features(predictor._fill(chunk.copy(), initial))
+        for col in df.select_dtypes(include=[np.number]).columns:
+            numeric_reservoirs.setdefault(col, Reservoir(reservoir_size)).update(df[col])
+    numeric = {col: r.median() for col, r in numeric_reservoirs.items() if r.seen}
+    predictor.imputation_values = {'initial': initial, 'numeric': numeric}
+
+    # Same classes LabelEncoder.fit would learn from the whole column
+    predictor.label_encoders = {}
+    for col in CATEGORICAL_COLUMNS:
+        encoder = LabelEncoder()
+        encoder.classes_ = np.array(sorted(categories[col]), dtype=object)
+        predictor.label_encoders[col] = encoder
+    target_encoder = LabelEncoder()
+    target_encoder.classes_ = np.array(sorted(categories[TARGET_COLUMN]), dtype=object)
+
+    # Pass 3: feature columns and scaler statistics over the training rows
+    predictor.feature_columns = None
+    predictor.scaler = StandardScaler()
+    start = 0
+    for chunk in iter_chunks(source, chunksize):
+        df = predictor.transform(chunk, fit=False, inplace=True)
+        if predictor.feature_columns is None:
+            predictor.feature_columns = [col for col in df.columns if col != TARGET_COLUMN]
+        train = ~_is_holdout(start, len(df))
+        if train.any():
+            predictor.scaler.partial_fit(df.loc[train, predictor.feature_columns])
+        start += len(chunk)
+
+    return target_encoder
+
+
+def train_streaming(predictor, source, chunksize=100000, models=None, n_epochs=1,
+                    reservoir_size=100000, scaled_models=()):
+    """Fit preprocessing and incremental models chunk by chunk; return holdout accuracies"""
+    models = models if models is not None else default_streaming_models()
+    print("Fitting preprocessing from streamed chunks...")
+    target_encoder = fit_streaming_preprocessing(predictor, source, chunksize, reservoir_size)
+    classes = np.arange(len(target_encoder.classes_))
+
+    print("Training incremental models...")
+    for epoch in range(n_epochs):
+        for X, y, holdout in _training_chunks(predictor, target_encoder, source, chunksize):
+            train = ~holdout
+            if not train.any():
+                continue
+            X_train = X[train]
+            X_train_scaled = predictor.scaler.transform(X_train)
+            for name, model in models.items():
+                model.partial_fit(X_train_scaled if name in scaled_models else X_train, y[train], classes=classes)
+
+    print("Evaluating on held-out rows...")
+    correct = {name: 0 for name in models}
+    total = 0
+    for X, y, holdout in _training_chunks(predictor, target_encoder, source, chunksize):
+        if not holdout.any():
+            continue
+        X_test = X[holdout]
+        X_test_scaled = predictor.scaler.transform(X_test)
+        for name, model in models.items():
+            predictions = model.predict(X_test_scaled if name in scaled_models else X_test)
+            correct[name] += int((predictions == y[holdout]).sum())
+        total += int(holdout.sum())
+
+    results = {name: correct[name] / total if total else 0.0 for name in models}
+    return models, results
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+"""
+Tree-ensemble inference compiler
+
+Flattens a fitted RandomForestClassifier or binary GradientBoostingClassifier
+into contiguous NumPy node arrays and scores them with a vectorized
+traversal that advances every (row, tree) pair one level per step. Only
+NumPy is needed to evaluate a compiled ensemble, so it can also be loaded
+from plain .npy files, memory-mapped.
+"""
+
+import json
+import os
+
+import numpy as np
+
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'value', 'roots', 'classes')
+META_FILE = 'ensemble.json'
+
+
+class CompiledTreeEnsemble:
+    """Flattened tree ensemble with predict_proba parity to sklearn
+
+    kind is 'forest' (per-leaf class probabilities averaged over trees) or
+    'boosting' (per-leaf raw values summed with learning_rate on top of
+    init_raw, then passed through the logistic function).
+    """
+
+    def __init__(self, kind, feature, threshold, left, right, value, roots, classes,
+                 max_depth, learning_rate=1.0, init_raw=0.0):
+        self.kind = kind
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = int(max_depth)
+        self.learning_rate = float(learning_rate)
+        self.init_raw = float(init_raw)
+        self.n_trees = len(roots)
+
+    @classmethod
+    def from_estimator(cls, model):
+        """Compile a fitted RandomForestClassifier or binary GradientBoostingClassifier"""
+        if len(model.classes_) != 2:
+            raise ValueError("Only binary classifiers can be compiled")
+
+        if hasattr(model, 'learning_rate'):
+            kind = 'boosting'
+            trees = [estimator.tree_ for estimator in np.asarray(model.estimators_).ravel()]
+            n_features = model.n_features_in_
+            init_raw = model._raw_predict_init(np.zeros((1, n_features), dtype=np.float32))[0, 0]
+            learning_rate = model.learning_rate
+        else:
+            kind = 'forest'
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            init_raw = 0.0
+            learning_rate = 1.0
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            n_nodes = tree.node_count
+            node_ids = np.arange(offset, offset + n_nodes)
+            is_leaf = tree.children_left == -1
+
+            # Leaves point at themselves so extra traversal steps are no-ops
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left + offset))
+            rights.append(np.where(is_leaf, node_ids, tree.children_right + offset))
+
+            if kind == 'forest':
+                # Same normalization DecisionTreeClassifier.predict_proba applies
+                proba = tree.value[:, 0, :].copy()
+                normalizer = proba.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                values.append(proba / normalizer)
+            else:
+                values.append(tree.value[:, 0, 0])
+
+            roots.append(offset)
+            offset += n_nodes
+
+        return cls(
+            kind,
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            classes=np.asarray(model.classes_),
+            max_depth=max(tree.max_depth for tree in trees),
+            learning_rate=learning_rate,
+            init_raw=init_raw
+        )
+
+    def apply(self, X):
+        """Return the leaf node index reached in every tree, shape (n_samples, n_trees)"""
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        """Class probabilities for X, matching the source estimator's predict_proba"""
+        leaves = self.apply(X)
+        leaf_values = self.value[leaves]
+
+        # Accumulate tree by tree in estimator order, as sklearn does
+        if self.kind == 'forest':
+            proba = np.zeros((leaves.shape[0], leaf_values.shape[2]))
+            for t in range(self.n_trees):
+                proba += leaf_values[:, t]
+            proba /= self.n_trees
+            return proba
+
+        raw = np.full(leaves.shape[0], self.init_raw)
+        for t in range(self.n_trees):
+            raw += self.learning_rate * leaf_values[:, t]
+        positive = 1.0 / (1.0 + np.exp(-raw))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        """Predicted class labels for X"""
+        return self.classes.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def save(self, directory):
+        """Write the node arrays as .npy files plus a small JSON header"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name), allow_pickle=False)
+        meta = {
+            'kind': self.kind,
+            'max_depth': self.max_depth,
+            'learning_rate': self.learning_rate,
+            'init_raw': self.init_raw
+        }
+        with open(os.path.join(directory, META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory, mmap_mode=None):
+        """Load an ensemble written by save(), optionally memory-mapping the node arrays"""
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+            for name in ARRAY_NAMES
+        }
+        return cls(meta['kind'], max_depth=meta['max_depth'], learning_rate=meta['learning_rate'],
+                   init_raw=meta['init_raw'], **arrays)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+
+"""
+Hyperparameter search with an on-disk result cache
+
+Samples configurations from a search space per model key and scores them
+with stratified k-fold cross-validation, spreading the (model, params,
+fold) fits across cores. With strategy='halving' every configuration is
+first scored on a few folds and only the best 1/eta of each model's
+configurations advance to more folds, as in selection.cross_validate_models.
+
+Each finished fit is written to its own small JSON file under cache_dir,
+keyed by the model, its full parameters, the fold and a fingerprint of the
+data, so rerunning a search after a crash or with a widened space only fits
+what has not been scored yet.
+"""
+
+import json
+import math
+import os
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+
+from .selection import score_fold
+
+# Default search spaces; lists keep sampled values JSON-friendly and cacheable
+SEARCH_SPACES = {
+    'logistic': {
+        'C': [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0],
+        'class_weight': [None, 'balanced']
+    },
+    'random_forest': {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [None, 6, 10, 16],
+        'min_samples_leaf': [1, 2, 5],
+        'max_features': ['sqrt', 0.5, None]
+    },
+    'gradient_boosting': {
+        'n_estimators': [100, 200, 300],
+        'learning_rate': [0.03, 0.1, 0.2],
+        'max_depth': [2, 3, 4],
+        'subsample': [0.8, 1.0]
+    },
+    'svm': {
+        'C': [0.1, 0.3, 1.0, 3.0, 10.0],
+        'gamma': ['scale', 0.01, 0.03, 0.1]
+    },
+    'svm_approx': {
+        'estimator__kernel__n_components': [100, 300, 600],
+        'estimator__kernel__gamma': [None, 0.03, 0.1, 0.3],
+        'estimator__linear__C': [0.1, 0.3, 1.0, 3.0]
+    },
+    'sgd_logistic': {
+        'alpha': [1e-5, 1e-4, 1e-3, 1e-2]
+    }
+}
+
+TUNING_CACHE_DIR = '.tuning_cache'
+
+
+def sample_candidates(space, n_iter, random_state=42):
+    """Up to n_iter distinct parameter dicts from space, the whole grid if it is smaller"""
+    grid = ParameterGrid(space)
+    if len(grid) <= n_iter:
+        return list(grid)
+    return list(ParameterSampler(space, n_iter, random_state=random_state))
+
+
+def _read_record(path):
+    """Cached result at path, or None if missing or unreadable (e.g. cut off by a crash)"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_record(path, record):
+    # Write then rename so a crash never leaves a half-written record behind
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(record, f)
+    os.replace(temporary, path)
+
+
+def _evaluate(model, X, y, train_idx, test_idx, scale, cache_path):
+    """Score one (configuration, fold) and record it in the cache as soon as it is done"""
+    _, accuracy, fit_time = score_fold(None, model, X, y, train_idx, test_idx, scale)
+    record = {'accuracy': accuracy, 'fit_time': fit_time}
+    if cache_path is not None:
+        _write_record(cache_path, record)
+    return record
+
+
+def search_hyperparameters(models, X, y, scaled_models=(), search_spaces=None, n_iter=10,
+                           strategy='halving', n_splits=5, min_folds=1, eta=3, n_jobs=None,
+                           backend=None, cache_dir=TUNING_CACHE_DIR, random_state=42):
+    """Search each model's space and return the best configuration per model
+
+    Only models with a search space are tuned. Every model's current
+    configuration is always a candidate, so tuning never picks something
+    that scored worse than the starting point. cache_dir=None disables the
+    result cache.
+
+    Returns {name: {'best_params', 'best_score', 'candidates', 'evaluated',
+    'cached'}}, where candidates lists {'params', 'mean_accuracy', 'folds'}
+    for every configuration tried.
+    """
+    if strategy not in ('random', 'halving'):
+        raise ValueError(f"Unknown search strategy: {strategy}")
+    if strategy == 'halving' and eta <= 1:
+        raise ValueError("eta must be greater than 1 for successive halving")
+
+    spaces = SEARCH_SPACES if search_spaces is None else search_spaces
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    folds = list(cv.split(X, y))
+    data_key = joblib.hash((X, y, n_splits, random_state))
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    # name -> list of (params, configured estimator, {fold: accuracy})
+    candidates = {}
+    for name, model in models.items():
+        if name not in spaces:
+            continue
+        params_list = [{}] + [p for p in sample_candidates(spaces[name], n_iter, random_state) if p]
+        candidates[name] = [(params, clone(model).set_params(**params), {}) for params in params_list]
+    counts = {name: {'evaluated': 0, 'cached': 0} for name in candidates}
+
+    active = {name: list(range(len(entries))) for name, entries in candidates.items()}
+    budget = min(min_folds, n_splits) if strategy == 'halving' else n_splits
+    while True:
+        tasks = []
+        for name, indices in active.items():
+            for index in indices:
+                _, estimator, scores = candidates[name][index]
+                for fold in range(budget):
+                    if fold in scores:
+                        continue
+                    cache_path = None
+                    if cache_dir is not None:
+                        key = joblib.hash((name, estimator.get_params(deep=False), fold, data_key))
+                        cache_path = os.path.join(cache_dir, f'{key}.json')
+                        record = _read_record(cache_path)
+                        if record is not None:
+                            scores[fold] = record['accuracy']
+                            counts[name]['cached'] += 1
+                            continue
+                    tasks.append((name, index, fold, cache_path))
+
+        outcomes = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(_evaluate)(candidates[name][index][1], X, y, *folds[fold], name in scaled_models, cache_path)
+            for name, index, fold, cache_path in tasks
+        )
+        for (name, index, fold, _), record in zip(tasks, outcomes):
+            candidates[name][index][2][fold] = record['accuracy']
+            counts[name]['evaluated'] += 1
+
+        if budget >= n_splits:
+            break
+
+        for name, indices in active.items():
+            # Stable sort keeps sampling order (current configuration first) among ties
+            ranked = sorted(indices, key=lambda index: -np.mean(list(candidates[name][index][2].values())))
+            active[name] = sorted(ranked[:max(1, math.ceil(len(indices) / eta))])
+        budget = min(int(math.ceil(budget * eta)), n_splits)
+
+    results = {}
+    for name, entries in candidates.items():
+        best = max(active[name], key=lambda index: np.mean(list(entries[index][2].values())))
+        results[name] = {
+            'best_params': entries[best][0],
+            'best_score': float(np.mean(list(entries[best][2].values()))),
+            'candidates': [
+                {'params': params, 'mean_accuracy': float(np.mean(list(scores.values()))), 'folds': len(scores)}
+                for params, _, scores in entries
+            ],
+            **counts[name]
+        }
+    return results
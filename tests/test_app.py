@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+
+import asyncio
+import json
+import tempfile
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import app as web_app
+import asgi
+
+APPLICANT = {
+    'gender': 'Male',
+    'married': 'Yes',
+    'dependents': '1',
+    'education': 'Graduate',
+    'self_employed': 'No',
+    'applicant_income': 60000,
+    'coapplicant_income': 0,
+    'loan_amount': 128000,
+    'loan_amount_term': 360,
+    'credit_history': '1.0',
+    'property_area': 'Urban'
+}
+
+class TestPredictionAPI(unittest.TestCase):
+    
+    def setUp(self):
+        if web_app.predictor is None:
+            self.skipTest('loan_predictor_model.pkl not found in working directory')
+        self.client = web_app.app.test_client()
+    
+    def test_batch_matches_single(self):
+        """Test that the batch endpoint returns the single endpoint's results in order"""
+        other = dict(APPLICANT, credit_history='0.0', property_area='Rural')
+        
+        batch = self.client.post('/api/predict/batch', json=[APPLICANT, other]).get_json()
+        self.assertTrue(batch['success'])
+        self.assertEqual(batch['count'], 2)
+        
+        for payload, result in zip([APPLICANT, other], batch['predictions']):
+            single = self.client.post('/api/predict', json=payload).get_json()
+            self.assertEqual(result, single)
+    
+    def test_batch_rejects_invalid_items(self):
+        """Test that batch validation reports the offending applicants"""
+        incomplete = {k: v for k, v in APPLICANT.items() if k != 'loan_amount'}
+        
+        response = self.client.post('/api/predict/batch', json=[APPLICANT, incomplete])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('1', response.get_json()['errors'])
+        
+        response = self.client.post('/api/predict/batch', json=APPLICANT)
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_fields_reported_together(self):
+        """Test that schema validation returns every field error in one 400 response"""
+        payload = dict(APPLICANT, gender='male', loan_amount='lots')
+        del payload['married']
+        response = self.client.post('/api/predict', json=payload)
+        self.assertEqual(response.status_code, 400)
+        body = response.get_json()
+        self.assertEqual(set(body['errors']), {'gender', 'loan_amount', 'married'})
+        self.assertIn("Missing required fields: ['married']", body['error'])
+        
+        # The form's '3+' dependents option is converted for the model and echoed as sent
+        result = self.client.post('/api/predict', json=dict(APPLICANT, dependents='3+')).get_json()
+        self.assertTrue(result['success'])
+        self.assertEqual(result['applicant_data']['Dependents'], '3+')
+    
+    def test_repeated_payload_hits_cache(self):
+        """Test that a resubmitted applicant is answered from the prediction cache"""
+        web_app.prediction_cache.clear()
+        before = web_app.prediction_cache.stats()
+        
+        first = self.client.post('/api/predict', json=APPLICANT).get_json()
+        second = self.client.post('/api/predict', json=APPLICANT).get_json()
+        
+        self.assertEqual(first, second)
+        after = self.client.get('/api/health').get_json()['prediction_cache']
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+class TestModelReload(unittest.TestCase):
+    
+    def setUp(self):
+        if web_app.predictor is None:
+            self.skipTest('loan_predictor_model.pkl not found in working directory')
+        self.client = web_app.app.test_client()
+        self.addCleanup(setattr, web_app, 'RELOAD_TOKEN', web_app.RELOAD_TOKEN)
+    
+    def test_reload_endpoint_swaps_predictor(self):
+        """Test that an authorized reload swaps in a new predictor and clears the cache"""
+        web_app.RELOAD_TOKEN = None
+        self.assertEqual(self.client.post('/api/admin/reload').status_code, 403)
+        web_app.RELOAD_TOKEN = 'secret'
+        response = self.client.post('/api/admin/reload', headers={'X-Reload-Token': 'wrong'})
+        self.assertEqual(response.status_code, 403)
+        
+        before = web_app.predictor
+        generation = web_app.prediction_cache.generation
+        response = self.client.post('/api/admin/reload', headers={'X-Reload-Token': 'secret'})
+        self.assertEqual(response.status_code, 202)
+        # Wait for the background reload to finish
+        with web_app.reloader._reload_lock:
+            pass
+        
+        self.assertIsNot(web_app.predictor, before)
+        self.assertGreater(web_app.prediction_cache.generation, generation)
+        health = self.client.get('/api/health').get_json()
+        self.assertEqual(health['model_reload']['state'], 'loaded')
+        self.assertTrue(self.client.post('/api/predict', json=APPLICANT).get_json()['success'])
+    
+    def test_smoke_validation_rejects_broken_model(self):
+        """Test that a predictor failing the smoke batch is never installed"""
+        class BrokenPredictor:
+            def predict_batch(self, applicants):
+                raise RuntimeError('corrupt estimator')
+        
+        current = web_app.predictor
+        web_app.validate_predictor(current)
+        reloader = web_app.ModelReloader(lambda path: BrokenPredictor(), web_app.validate_predictor,
+                                         web_app.install_predictor)
+        self.assertFalse(reloader.reload(web_app.MODEL_PATH))
+        self.assertIs(web_app.predictor, current)
+
+    def test_validation_loads_deferred_estimator(self):
+        """Test that validating a compiled directory bundle also loads its estimator"""
+        trained = web_app.LoanPredictor()
+        trained.models = {'random_forest': trained.models['random_forest']}
+        trained.train_models(trained.create_sample_data(200))
+        with tempfile.TemporaryDirectory() as tmp:
+            trained.save_model(tmp, mmap=True)
+            candidate = web_app.load_predictor(tmp)
+            self.assertIsNotNone(candidate._lazy_model)
+            
+            web_app.validate_predictor(candidate)
+            self.assertIsNone(candidate._lazy_model)
+            self.assertEqual(candidate.best_model_name, 'random_forest')
+
+class TestMetricsEndpoint(unittest.TestCase):
+    
+    def setUp(self):
+        if web_app.predictor is None:
+            self.skipTest('loan_predictor_model.pkl not found in working directory')
+        self.client = web_app.app.test_client()
+    
+    def test_metrics_count_requests_and_stages(self):
+        """Test that /metrics reports request counts, errors and per-stage latencies"""
+        labels = {'endpoint': '/api/predict', 'method': 'POST', 'status': 200}
+        before = web_app.REQUESTS.value(**labels)
+        web_app.prediction_cache.clear()
+        self.client.post('/api/predict', json=APPLICANT)
+        self.client.post('/api/predict', json={'gender': 'Male'})
+        
+        self.assertEqual(web_app.REQUESTS.value(**labels), before + 1)
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        self.assertIn('loan_request_errors_total{endpoint="/api/predict",status="400"}', text)
+        self.assertIn('loan_request_duration_seconds_count{endpoint="/api/predict"}', text)
+        for stage in ('json_parse', 'validation', 'serialization', 'predict_proba'):
+            self.assertIn(f'loan_stage_duration_seconds_count{{stage="{stage}"}}', text)
+
+class TestMicroBatchingASGI(unittest.TestCase):
+    
+    def setUp(self):
+        if web_app.predictor is None:
+            self.skipTest('loan_predictor_model.pkl not found in working directory')
+        web_app.prediction_cache.clear()
+    
+    async def call(self, method, path, payload=None):
+        """Drive the ASGI app directly and return (status, decoded JSON body)"""
+        body = json.dumps(payload).encode() if payload is not None else b''
+        received = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        sent = []
+        
+        async def receive():
+            return received.pop(0)
+        
+        async def send(message):
+            sent.append(message)
+        
+        await asgi.app({'type': 'http', 'method': method, 'path': path}, receive, send)
+        return sent[0]['status'], json.loads(sent[1]['body'])
+    
+    def test_concurrent_requests_match_flask(self):
+        """Test that micro-batched responses equal the Flask endpoint's responses"""
+        payloads = [dict(APPLICANT, applicant_income=30000 + 10000 * i) for i in range(5)]
+        client = web_app.app.test_client()
+        expected = [client.post('/api/predict', json=p).get_json() for p in payloads]
+        web_app.prediction_cache.clear()
+        
+        async def scenario():
+            responses = await asyncio.gather(*(self.call('POST', '/api/predict', p) for p in payloads))
+            await asgi.batcher.close()
+            return responses
+        
+        before = asgi.batcher.batches_scored
+        responses = asyncio.run(scenario())
+        
+        self.assertEqual([status for status, _ in responses], [200] * 5)
+        self.assertEqual([body for _, body in responses], expected)
+        self.assertLess(asgi.batcher.batches_scored - before, 5)
+    
+    def test_validation_errors(self):
+        """Test that missing fields are rejected before queuing"""
+        incomplete = {k: v for k, v in APPLICANT.items() if k != 'gender'}
+        status, body = asyncio.run(self.call('POST', '/api/predict', incomplete))
+        self.assertEqual(status, 400)
+        self.assertIn('gender', body['error'])
+    
+    def test_metrics_endpoint(self):
+        """Test that ASGI requests are recorded in the shared metrics registry"""
+        labels = {'endpoint': '/api/predict', 'method': 'POST', 'status': 400}
+        before = web_app.REQUESTS.value(**labels)
+        asyncio.run(self.call('POST', '/api/predict', {}))
+        self.assertEqual(web_app.REQUESTS.value(**labels), before + 1)
+        
+        async def scrape():
+            received = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            sent = []
+            
+            async def receive():
+                return received.pop(0)
+            
+            async def send(message):
+                sent.append(message)
+            
+            await asgi.app({'type': 'http', 'method': 'GET', 'path': '/metrics'}, receive, send)
+            return sent
+        
+        start, body = asyncio.run(scrape())
+        self.assertEqual(start['status'], 200)
+        self.assertIn(b'loan_requests_total{endpoint="/api/predict",method="POST",status="400"}', body['body'])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import asyncio
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.batching import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    
+    def test_concurrent_submits_share_a_batch(self):
+        """Test that concurrent items are scored together and routed back to their callers"""
+        batches = []
+        
+        def score(items):
+            batches.append(list(items))
+            return [item * 10 for item in items]
+        
+        async def scenario():
+            batcher = MicroBatcher(score, max_batch_size=4, max_wait_ms=50)
+            results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+            await batcher.close()
+            return results
+        
+        results = asyncio.run(scenario())
+        
+        self.assertEqual(results, [i * 10 for i in range(10)])
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+    
+    def test_lone_request_waits_at_most_max_wait(self):
+        """Test that a single request is flushed once the wait window expires"""
+        async def scenario():
+            batcher = MicroBatcher(lambda items: items, max_batch_size=64, max_wait_ms=1)
+            result = await asyncio.wait_for(batcher.submit('x'), timeout=5)
+            await batcher.close()
+            return result, batcher.batches_scored
+        
+        self.assertEqual(asyncio.run(scenario()), ('x', 1))
+    
+    def test_errors_reach_every_caller_in_the_batch(self):
+        """Test that a scoring failure is raised to each request and the batcher keeps serving"""
+        calls = []
+        
+        def score(items):
+            calls.append(items)
+            if len(calls) == 1:
+                raise ValueError('bad batch')
+            return items
+        
+        async def scenario():
+            batcher = MicroBatcher(score, max_batch_size=8, max_wait_ms=20)
+            failed = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+            recovered = await batcher.submit(3)
+            await batcher.close()
+            return failed, recovered
+        
+        failed, recovered = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(e, ValueError) for e in failed))
+        self.assertEqual(recovered, 3)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
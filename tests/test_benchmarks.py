@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import unittest
+import json
+import sys
+import os
+import subprocess
+sys.path.append(os.path.join(os.path.dirname(__file__), '../benchmarks'))
+import run_benchmarks
+
+class TestBenchmarkSuite(unittest.TestCase):
+    
+    def test_size_report_is_json_serializable(self):
+        """Test that one dataset size produces timings for every pipeline stage"""
+        result, df, predictor = run_benchmarks.bench_size(200, max_train_rows=1000, n_jobs=None)
+        result['predict_batch'] = run_benchmarks.bench_batch(predictor, df)
+        
+        json.dumps(result)
+        for key in ['create_sample_data_s', 'preprocess_data_s', 'encode_features_s']:
+            self.assertGreaterEqual(result[key], 0)
+        self.assertEqual(set(result['train_models']['fit']),
+                         {f'{name}_s' for name in predictor.models})
+        self.assertEqual(result['predict_batch']['rows'], 200)
+        self.assertLess(result['compact']['compact_bytes'], result['compact']['default_bytes'])
+        
+        skipped, _, _ = run_benchmarks.bench_size(200, max_train_rows=100, n_jobs=None)
+        self.assertIn('skipped', skipped['train_models'])
+    
+    def test_compare_flags_only_regressions(self):
+        """Test that slower durations and lower throughputs beyond tolerance are reported"""
+        baseline = {'meta': {'cpu_count': 4}, 'a': {'fit_s': 1.0, 'p99_ms': 2.0, 'rows_per_sec': 100.0}}
+        current = {'meta': {'cpu_count': 8}, 'a': {'fit_s': 1.1, 'p99_ms': 3.0, 'rows_per_sec': 50.0}}
+        
+        regressions = run_benchmarks.compare(baseline, current, tolerance=0.2)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('a.p99_ms'))
+        self.assertTrue(regressions[1].startswith('a.rows_per_sec'))
+    
+    def test_import_time_is_lazy(self):
+        """Test that importing the package defers its heavy modules to first use"""
+        package = run_benchmarks.import_time('import loan_predictor', repeat=1)
+        module = run_benchmarks.import_time('import loan_predictor.loan_predictor', repeat=1)
+        
+        self.assertGreater(package, 0)
+        self.assertLess(package, module)
+    
+    def test_lazy_package_imports(self):
+        """Test that the package and the portable runtime load without pandas or scikit-learn"""
+        code = ("import sys, loan_predictor, loan_predictor.portable; "
+                "print(sorted(m for m in ('pandas', 'sklearn') if m in sys.modules)); "
+                "print(sorted(loan_predictor.LoanPredictor().models))")
+        completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                   env=dict(os.environ, PYTHONPATH=os.path.join(run_benchmarks.ROOT, 'src')))
+        
+        before, models = completed.stdout.splitlines()
+        self.assertEqual(before, '[]')
+        self.assertEqual(models, str(sorted(['random_forest', 'logistic', 'gradient_boosting', 'svm'])))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
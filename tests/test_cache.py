@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.cache import PredictionCache, make_key
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestPredictionCache(unittest.TestCase):
+    
+    def test_key_is_order_independent(self):
+        """Test that applicant dicts with the same items share a key"""
+        self.assertEqual(make_key({'a': 1, 'b': 'x'}), make_key({'b': 'x', 'a': 1}))
+        self.assertNotEqual(make_key({'a': 1}), make_key({'a': 2}))
+    
+    def test_lru_eviction_and_counters(self):
+        """Test that the least recently used entry is evicted and lookups are counted"""
+        cache = PredictionCache(maxsize=2, ttl=None)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (3, 1, 2))
+    
+    def test_ttl_expiry_and_clear(self):
+        """Test that entries expire after the TTL and clear() empties the cache"""
+        clock = FakeClock()
+        cache = PredictionCache(maxsize=10, ttl=5, clock=clock)
+        cache.put('a', 1)
+        clock.now = 4.9
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 5.0
+        self.assertIsNone(cache.get('a'))
+        
+        cache.put('b', 2)
+        cache.clear()
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['size'], 0)
+    
+    def test_disabled_cache(self):
+        """Test that maxsize=0 never stores anything"""
+        cache = PredictionCache(maxsize=0)
+        cache.put('a', 1)
+        self.assertIsNone(cache.get('a'))
+    
+    def test_put_from_before_clear_is_dropped(self):
+        """Test that a result computed before a clear() is not stored after it"""
+        cache = PredictionCache(maxsize=10, ttl=None)
+        generation = cache.generation
+        cache.clear()
+        cache.put('a', 'stale', generation)
+        self.assertIsNone(cache.get('a'))
+        
+        cache.put('a', 'fresh', cache.generation)
+        self.assertEqual(cache.get('a'), 'fresh')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.data_generation import generate_chunk, generate_sample_chunks, write_sample_data
+from loan_predictor.loan_predictor import LoanPredictor
+
+class TestDataGeneration(unittest.TestCase):
+    
+    def test_chunks_are_reproducible_and_independent(self):
+        """Test that chunking is deterministic per chunk and leaves the global RNG alone"""
+        state = np.random.get_state()[1].copy()
+        chunks = list(generate_sample_chunks(2500, chunk_size=1000, seed=7))
+        np.testing.assert_array_equal(np.random.get_state()[1], state)
+        
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 500])
+        self.assertEqual(chunks[2].index[0], 2000)
+        pd.testing.assert_frame_equal(chunks[1], generate_chunk(1000, seed=7, chunk_index=1, start=1000))
+        self.assertFalse(chunks[0]['ApplicantIncome'].equals(chunks[1]['ApplicantIncome'].reset_index(drop=True)))
+    
+    def test_schema_matches_create_sample_data(self):
+        """Test that generated chunks have the sample schema with compact dtypes and train normally"""
+        chunk = generate_chunk(1000)
+        reference = LoanPredictor().create_sample_data(10)
+        
+        self.assertListEqual(list(chunk.columns), list(reference.columns))
+        self.assertIsInstance(chunk['Gender'].dtype, pd.CategoricalDtype)
+        self.assertEqual(chunk['Dependents'].dtype, np.int8)
+        self.assertTrue(set(chunk['Loan_Status'].unique()) <= {'Y', 'N'})
+        
+        predictor = LoanPredictor()
+        results = predictor.train_models(chunk)
+        self.assertGreater(max(results.values()), 0.8)
+    
+    def test_write_csv_and_jsonl(self):
+        """Test that data streams to disk chunk by chunk and reads back intact"""
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, reader in [('data.csv', pd.read_csv), ('data.jsonl', lambda p: pd.read_json(p, lines=True))]:
+                path = os.path.join(tmp, name)
+                self.assertEqual(write_sample_data(path, 2500, chunk_size=1000), 2500)
+                self.assertEqual(write_sample_data(path, 1500, chunk_size=1000), 1500)
+                loaded = reader(path)
+                self.assertEqual(len(loaded), 1500)
+                self.assertListEqual(list(loaded['Gender'].head(1000)),
+                                     list(generate_chunk(1000)['Gender'].astype(str)))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
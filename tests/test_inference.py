@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+
+class TestCompiledInference(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.predictor = LoanPredictor()
+        cls.data = cls.predictor.create_sample_data(200)
+        cls.predictor.train_models(cls.data)
+    
+    def setUp(self):
+        self.predictor.compiled_inference = None
+    
+    def assert_parity(self, applicants):
+        expected = [self.predictor.predict_loan(a) for a in applicants]
+        self.predictor.compile_inference(trees=False)
+        actual = [self.predictor.predict_loan(a) for a in applicants]
+        self.assertEqual(actual, expected)
+    
+    def test_compiled_matches_dataframe_path(self):
+        """Test that every trained model scores identically through the compiled path"""
+        applicants = self.data.drop(['Loan_Status'], axis=1).head(25).to_dict('records')
+        web_style = dict(applicants[0], Dependents='2', ApplicantIncome=4166.67, LoanAmount=128.0)
+        applicants.append(web_style)
+        applicants.append(dict(applicants[1], Gender=None, LoanAmount=float('nan'), Credit_History=None))
+        applicants.append(dict(applicants[2], ApplicantIncome=float('nan'), Dependents=float('nan')))
+        applicants.append(dict(applicants[3], LoanAmount=0))
+        
+        original = self.predictor.best_model
+        try:
+            for name, model in self.predictor.models.items():
+                self.predictor.best_model = (name, model)
+                self.predictor.compiled_inference = None
+                self.assert_parity(applicants)
+        finally:
+            self.predictor.best_model = original
+    
+    def test_vectorize_falls_back(self):
+        """Test that rows the compiled tables cannot represent are rejected"""
+        compiled = self.predictor.compile_inference()
+        applicant = self.data.drop(['Loan_Status'], axis=1).iloc[0].to_dict()
+        
+        self.assertIsNotNone(compiled.vectorize(applicant))
+        self.assertIsNone(compiled.vectorize(dict(applicant, Gender='Unknown')))
+        self.assertIsNone(compiled.vectorize(dict(applicant, Education=None)))
+        self.assertIsNone(compiled.vectorize({'Gender': 'Male'}))
+        
+        with self.assertRaises(ValueError):
+            self.predictor.predict_loan(dict(applicant, Gender='Unknown'))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -5,7 +5,10 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import tempfile
+import warnings
 sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from sklearn.linear_model import SGDClassifier
 from loan_predictor.loan_predictor import LoanPredictor
 
 class TestLoanPredictor(unittest.TestCase):
@@ -98,6 +101,53 @@ class TestLoanPredictor(unittest.TestCase):
         self.assertIsInstance(result['probability'], float)
         self.assertTrue(0 <= result['probability'] <= 1)
     
+    def test_predict_batch_matches_predict_loan(self):
+        """Test that batch scoring agrees with single-applicant scoring"""
+        sample_data = self.predictor.create_sample_data(200)
+        self.predictor.train_models(sample_data)
+        
+        applicants = sample_data.drop(['Loan_Status'], axis=1).head(20)
+        results = self.predictor.predict_batch(applicants)
+        
+        self.assertEqual(len(results), 20)
+        self.assertListEqual(list(results.index), list(applicants.index))
+        for idx, row in applicants.iterrows():
+            single = self.predictor.predict_loan(row.to_dict())
+            self.assertEqual(bool(results.loc[idx, 'approved']), single['approved'])
+            self.assertAlmostEqual(results.loc[idx, 'probability'], single['probability'])
+            self.assertEqual(results.loc[idx, 'model_used'], single['model_used'])
+    
+    def test_imputation_uses_training_statistics(self):
+        """Test that inference fills gaps with training-time values, independent of the batch"""
+        sample_data = self.predictor.create_sample_data(200)
+        self.predictor.train_models(sample_data)
+        
+        applicants = sample_data.drop(['Loan_Status'], axis=1).head(10).copy()
+        applicants['LoanAmount'] = applicants['LoanAmount'].astype(float)
+        applicants.loc[applicants.index[0], 'LoanAmount'] = np.nan
+        applicants.loc[applicants.index[0], 'Credit_History'] = np.nan
+        
+        processed = self.predictor.preprocess_data(applicants, fit=False)
+        initial = self.predictor.imputation_values['initial']
+        self.assertEqual(processed['LoanAmount'].iloc[0], initial['LoanAmount'])
+        self.assertEqual(processed['Credit_History'].iloc[0], initial['Credit_History'])
+        
+        # The same applicant scores the same alone and inside different batches
+        first = applicants.iloc[[0]]
+        alone = self.predictor.predict_batch(first)['probability'].iloc[0]
+        in_batch = self.predictor.predict_batch(applicants)['probability'].iloc[0]
+        in_reversed = self.predictor.predict_batch(applicants.iloc[::-1])['probability'].iloc[-1]
+        self.assertEqual(alone, in_batch)
+        self.assertEqual(alone, in_reversed)
+        
+        # Imputation values survive a save/load round trip
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model.pkl')
+            self.predictor.save_model(path)
+            loaded = LoanPredictor()
+            loaded.load_model(path)
+        self.assertEqual(loaded.imputation_values, self.predictor.imputation_values)
+    
     def test_model_performance(self):
         """Test that model achieves reasonable performance"""
         # Train on larger sample
@@ -137,6 +187,197 @@ class TestLoanPredictor(unittest.TestCase):
         result = self.predictor.predict_loan(extreme_applicant)
         self.assertIsNotNone(result)
 
+    def test_parallel_training_matches_sequential(self):
+        """Test that concurrent model fitting selects and scores exactly like a sequential run"""
+        sample_data = self.predictor.create_sample_data(200)
+        sequential = self.predictor.train_models(sample_data)
+        
+        parallel_predictor = LoanPredictor()
+        parallel = parallel_predictor.train_models(sample_data, n_jobs=2)
+        
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(parallel_predictor.best_model[0], self.predictor.best_model[0])
+        self.assertEqual(set(parallel_predictor.fit_times), set(sequential))
+        self.assertTrue(all(t >= 0 for t in parallel_predictor.fit_times.values()))
+        
+        applicants = sample_data.drop(['Loan_Status'], axis=1).head(10)
+        pd.testing.assert_frame_equal(
+            parallel_predictor.predict_batch(applicants),
+            self.predictor.predict_batch(applicants)
+        )
+
+    def test_memory_mapped_model_directory(self):
+        """Test the directory model format with lazy, memory-mapped estimator loading"""
+        sample_data = self.predictor.create_sample_data(200)
+        self.predictor.train_models(sample_data)
+        applicants = sample_data.drop(['Loan_Status'], axis=1).head(10)
+        expected = self.predictor.predict_batch(applicants)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model')
+            self.predictor.save_model(path, mmap=True)
+            self.assertTrue(os.path.isfile(os.path.join(path, 'manifest.json')))
+            
+            loaded = LoanPredictor()
+            loaded.load_model(path)
+            
+            # Only the manifest and preprocessing state are read up front
+            self.assertIsNone(loaded._best_model)
+            self.assertEqual(loaded.best_model_name, self.predictor.best_model[0])
+            loaded.compile_inference()
+            self.assertIsNone(loaded._best_model)
+            
+            pd.testing.assert_frame_equal(loaded.predict_batch(applicants), expected)
+            self.assertEqual(loaded.best_model[0], self.predictor.best_model[0])
+            
+            pickled = LoanPredictor()
+            pickled_path = os.path.join(tmp, 'model.pkl')
+            self.predictor.save_model(pickled_path)
+            pickled.load_model(pickled_path, mmap_mode='r')
+            pd.testing.assert_frame_equal(pickled.predict_batch(applicants), expected)
+    
+    def test_saving_over_a_loaded_model_directory(self):
+        """Test that re-saving a directory bundle leaves predictors that loaded it unchanged"""
+        sample_data = self.predictor.create_sample_data(300)
+        applicants = sample_data.drop(['Loan_Status'], axis=1).head(20)
+        forest = LoanPredictor()
+        forest.models = {'random_forest': forest.models['random_forest']}
+        forest.train_models(sample_data)
+        logistic = LoanPredictor()
+        logistic.models = {'logistic': logistic.models['logistic']}
+        logistic.train_models(self.predictor.create_sample_data(300))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model')
+            forest.save_model(path, mmap=True)
+            compiled, deferred = LoanPredictor(), LoanPredictor()
+            compiled.load_model(path)
+            compiled.compile_inference()
+            deferred.load_model(path)
+            expected = compiled.predict_batch(applicants)
+            
+            logistic.save_model(path, mmap=True)
+            pd.testing.assert_frame_equal(compiled.predict_batch(applicants), expected)
+            pd.testing.assert_frame_equal(deferred.predict_batch(applicants), expected)
+            
+            reloaded = LoanPredictor()
+            reloaded.load_model(path)
+            self.assertEqual(reloaded.best_model_name, 'logistic')
+            
+            # Only the current version and the one it replaced are kept
+            logistic.save_model(path, mmap=True)
+            versions = [entry for entry in os.listdir(path) if entry.startswith('version-')]
+            self.assertEqual(len(versions), 2)
+    
+    def test_compact_mode_matches_default(self):
+        """Test that compact mode shrinks the encoded frame without changing predictions"""
+        df = self.predictor.create_sample_data(500)
+        df.loc[::7, 'Gender'] = np.nan
+        compact = LoanPredictor(compact=True)
+        
+        default_encoded = self.predictor.encode_features(self.predictor.preprocess_data(df), fit=True)
+        compact_encoded = compact.encode_features(compact.preprocess_data(df), fit=True)
+        
+        self.assertEqual(compact_encoded['Gender'].dtype, np.int8)
+        self.assertLess(compact_encoded.memory_usage(deep=True).sum(),
+                        default_encoded.memory_usage(deep=True).sum())
+        features = [col for col in default_encoded.columns if col != 'Loan_Status']
+        np.testing.assert_array_equal(compact_encoded[features].to_numpy(dtype=float),
+                                      default_encoded[features].to_numpy(dtype=float))
+        for col, encoder in self.predictor.label_encoders.items():
+            self.assertListEqual(list(compact.label_encoders[col].classes_), list(encoder.classes_))
+        
+        unseen = df.head(1).copy()
+        unseen['Property_Area'] = 'Offshore'
+        # Detected without relying on deprecated pandas behaviour that a future version turns into an error
+        with warnings.catch_warnings(record=True) as caught, self.assertRaises(ValueError):
+            warnings.simplefilter('always')
+            compact.encode_features(compact.preprocess_data(unseen, fit=False), fit=False)
+        self.assertEqual([str(w.message) for w in caught if 'deprecat' in str(w.message).lower()], [])
+
+    def test_retrain_incremental(self):
+        """Test that incremental retraining extends the saved best model instead of refitting"""
+        from loan_predictor.data_generation import generate_chunk
+        history, new_rows = generate_chunk(600, chunk_index=0), generate_chunk(100, chunk_index=1)
+        self.predictor.models = {'random_forest': self.predictor.models['random_forest']}
+        self.predictor.train_models(history)
+        n_trees = self.predictor.best_model[1].n_estimators
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'model')
+            self.predictor.save_model(path, mmap=True)
+            updated = LoanPredictor()
+            result = updated.retrain_incremental(new_rows, filename=path, n_new_estimators=5)
+        
+        self.assertEqual(result['rows'], 100)
+        model = updated.best_model[1]
+        self.assertEqual(len(model.estimators_), n_trees + 5)
+        self.assertFalse(model.warm_start)
+        self.assertEqual(updated.scaler.n_samples_seen_, self.predictor.scaler.n_samples_seen_ + 100)
+        self.assertIn('approved', updated.predict_loan(new_rows.drop(['Loan_Status'], axis=1).iloc[0].to_dict()))
+        
+        sgd = LoanPredictor()
+        sgd.models = {'sgd_logistic': SGDClassifier(loss='log_loss', random_state=42)}
+        sgd.train_models(history)
+        coef = sgd.best_model[1].coef_.copy()
+        sgd.retrain_incremental(new_rows)
+        fresh = SGDClassifier(loss='log_loss', random_state=42).partial_fit(
+            sgd.scaler.transform(sgd.transform(new_rows, fit=False)[sgd.feature_columns]),
+            (new_rows['Loan_Status'] == 'Y').astype(int), classes=[0, 1])
+        # One pass over the new rows moves the existing coefficients; it does not start over
+        self.assertFalse(np.array_equal(sgd.best_model[1].coef_, coef))
+        self.assertLess(np.abs(sgd.best_model[1].coef_ - coef).max(),
+                        np.abs(sgd.best_model[1].coef_ - fresh.coef_).max())
+        
+        # Warm-started full fits would converge to the new rows alone
+        for name in ('logistic', 'svm'):
+            full_fit = LoanPredictor()
+            full_fit.models = {name: full_fit.models[name]}
+            full_fit.train_models(history)
+            with self.assertRaises(ValueError):
+                full_fit.retrain_incremental(new_rows)
+    
+    def test_retrain_incremental_rejects_one_class_batches(self):
+        """Test that a one-label batch leaves a tree model, its scaler and its predictions untouched"""
+        from loan_predictor.data_generation import generate_chunk
+        history, new_rows = generate_chunk(600, chunk_index=0), generate_chunk(100, chunk_index=1)
+        approved_only = new_rows[new_rows['Loan_Status'] == 'Y']
+        applicants = new_rows.drop(['Loan_Status'], axis=1).head(3)
+        for name in ('random_forest', 'gradient_boosting'):
+            with self.subTest(model=name):
+                predictor = LoanPredictor()
+                predictor.models = {name: predictor.models[name]}
+                predictor.train_models(history)
+                model = predictor.best_model[1]
+                n_estimators, seen = model.n_estimators, predictor.scaler.n_samples_seen_
+                expected = predictor.predict_batch(applicants)
+                
+                with self.assertRaises(ValueError):
+                    predictor.retrain_incremental(approved_only)
+                self.assertEqual(model.n_estimators, n_estimators)
+                self.assertFalse(model.warm_start)
+                self.assertEqual(predictor.scaler.n_samples_seen_, seen)
+                pd.testing.assert_frame_equal(predictor.predict_batch(applicants), expected)
+    
+    def test_kernel_approximation_replaces_exact_svm(self):
+        """Test that kernel_approximation trains a calibrated Nystroem candidate instead of SVC"""
+        predictor = LoanPredictor(kernel_approximation=50)
+        self.assertNotIn('svm', predictor.models)
+        self.assertEqual(predictor.models['svm_approx'].estimator.named_steps['kernel'].n_components, 50)
+        
+        predictor.models = {'svm_approx': predictor.models['svm_approx']}
+        df = predictor.create_sample_data(300)
+        predictor.train_models(df)
+        self.assertEqual(predictor.best_model_name, 'svm_approx')
+        self.assertEqual(len(predictor.best_model[1].calibrated_classifiers_), 3)
+        
+        applicant = df.drop(['Loan_Status'], axis=1).iloc[0].to_dict()
+        result = predictor.predict_loan(applicant)
+        self.assertEqual(result['model_used'], 'svm_approx')
+        self.assertEqual(result['approved'], result['probability'] > 0.5)
+        with self.assertRaises(ValueError):
+            predictor.retrain_incremental(df.head(20))
+
 class TestModelComparison(unittest.TestCase):
     """Test different aspects of model performance"""
     
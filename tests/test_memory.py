@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import unittest
+import tracemalloc
+import contextlib
+import io
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from loan_predictor.loan_predictor import LoanPredictor
+
+def peak_memory(fn, *args, **kwargs):
+    """Peak traced allocation (bytes) above the starting level while fn runs"""
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] - start
+    finally:
+        tracemalloc.stop()
+
+class TestMemoryProfile(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a predictor with a single cheap model so the data handling dominates"""
+        self.predictor = LoanPredictor()
+        self.predictor.models = {'logistic': LogisticRegression(random_state=42)}
+        self.df = self.predictor.create_sample_data(50000)
+    
+    def unfused_pipeline(self, df):
+        """The copy-per-step pipeline train_models used before the fused transform"""
+        predictor = LoanPredictor()
+        df = predictor.encode_features(predictor.preprocess_data(df), fit=True)
+        X = df.drop(['Loan_Status'], axis=1)
+        y = LabelEncoder().fit_transform(df['Loan_Status'])
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+        LogisticRegression(random_state=42).fit(X_train_scaled, y_train).predict(X_test_scaled)
+    
+    def test_transform_copies_at_most_once(self):
+        """Test that the fused transform peaks well below preprocess_data + encode_features"""
+        unfused = peak_memory(lambda: self.predictor.encode_features(self.predictor.preprocess_data(self.df)))
+        fused = peak_memory(self.predictor.transform, self.df)
+        in_place = peak_memory(self.predictor.transform, self.df.copy(), inplace=True)
+        
+        self.assertLess(fused, unfused / 2)
+        self.assertLessEqual(in_place, fused)
+    
+    def test_train_models_peak_memory(self):
+        """Test that train_models peaks measurably lower than the unfused pipeline"""
+        unfused = peak_memory(self.unfused_pipeline, self.df)
+        fused = peak_memory(self.predictor.train_models, self.df)
+        
+        self.assertLess(fused, unfused * 0.8)
+    
+    def test_inplace_training_matches_copy(self):
+        """Test that training in place gives the same results and consumes the target column"""
+        expected = self.predictor.train_models(self.df)
+        owned = self.df.copy()
+        predictor = LoanPredictor()
+        predictor.models = {'logistic': LogisticRegression(random_state=42)}
+        results = predictor.train_models(owned, inplace=True)
+        
+        self.assertEqual(results, expected)
+        self.assertNotIn('Loan_Status', owned.columns)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
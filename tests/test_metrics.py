@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.metrics import MetricsRegistry, StageTimer
+
+class TestMetricsRegistry(unittest.TestCase):
+    
+    def setUp(self):
+        self.registry = MetricsRegistry()
+    
+    def test_counter_rendering(self):
+        """Test that counters accumulate per label set and render in exposition format"""
+        requests = self.registry.counter('requests_total', 'Requests', ['endpoint', 'status'])
+        requests.inc(endpoint='/api/predict', status=200)
+        requests.inc(2, endpoint='/api/predict', status=200)
+        requests.inc(endpoint='/api/predict', status=400)
+        
+        self.assertEqual(requests.value(endpoint='/api/predict', status=200), 3)
+        text = self.registry.render()
+        self.assertIn('# TYPE requests_total counter', text)
+        self.assertIn('requests_total{endpoint="/api/predict",status="200"} 3', text)
+        self.assertIn('requests_total{endpoint="/api/predict",status="400"} 1', text)
+    
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets, sum and count follow the Prometheus conventions"""
+        latency = self.registry.histogram('latency_seconds', 'Latency', ['stage'], buckets=[0.1, 1.0])
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, stage='parse')
+        
+        text = self.registry.render()
+        self.assertIn('latency_seconds_bucket{stage="parse",le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{stage="parse",le="1.0"} 3', text)
+        self.assertIn('latency_seconds_bucket{stage="parse",le="+Inf"} 4', text)
+        self.assertIn('latency_seconds_sum{stage="parse"} 3.65', text)
+        self.assertIn('latency_seconds_count{stage="parse"} 4', text)
+        self.assertEqual(latency.count(stage='parse'), 4)
+    
+    def test_label_validation(self):
+        """Test that missing or unexpected labels and duplicate names are rejected"""
+        requests = self.registry.counter('requests_total', 'Requests', ['endpoint'])
+        with self.assertRaises(ValueError):
+            requests.inc()
+        with self.assertRaises(ValueError):
+            requests.inc(endpoint='/', method='GET')
+        with self.assertRaises(ValueError):
+            self.registry.histogram('requests_total', 'Duplicate')
+    
+    def test_stage_timer_reports_on_error(self):
+        """Test that StageTimer reports elapsed time even when the block raises"""
+        observed = []
+        with self.assertRaises(KeyError):
+            with StageTimer(lambda stage, seconds: observed.append((stage, seconds)), 'validation'):
+                raise KeyError('gender')
+        self.assertEqual(len(observed), 1)
+        self.assertEqual(observed[0][0], 'validation')
+        self.assertGreaterEqual(observed[0][1], 0)
+
+class TestPredictorStages(unittest.TestCase):
+    
+    def setUp(self):
+        """Train a small scaled model so every prediction stage runs"""
+        self.predictor = LoanPredictor()
+        self.predictor.models = {'logistic': self.predictor.models['logistic']}
+        self.df = self.predictor.create_sample_data(300)
+        self.predictor.train_models(self.df)
+        self.stages = []
+        self.predictor.stage_observer = lambda stage, seconds: self.stages.append(stage)
+    
+    def test_batch_prediction_stages(self):
+        """Test that batch scoring reports preprocessing, encoding, scaling and predict_proba"""
+        self.predictor.predict_batch(self.df.drop(columns=['Loan_Status']).head(10))
+        self.assertEqual(self.stages, ['preprocess_data', 'encode_features', 'scaling', 'predict_proba', 'predict'])
+    
+    def test_compiled_single_prediction_stages(self):
+        """Test that compiled single-applicant scoring reports the same stages as the pandas path"""
+        applicant = self.df.drop(columns=['Loan_Status']).iloc[0].to_dict()
+        expected = self.predictor.predict_loan(applicant)
+        pandas_stages, self.stages[:] = list(self.stages), []
+        
+        self.predictor.compile_inference()
+        self.assertEqual(self.predictor.predict_loan(applicant), expected)
+        self.assertEqual(self.stages, ['preprocess_data', 'encode_features', 'scaling', 'predict_proba', 'predict'])
+        self.assertEqual(self.stages, pandas_stages)
+    
+    def test_no_observer_by_default(self):
+        """Test that predictions work untimed when no observer is set"""
+        self.predictor.stage_observer = None
+        result = self.predictor.predict_batch(self.df.drop(columns=['Loan_Status']).head(3))
+        self.assertEqual(len(result), 3)
+        self.assertEqual(self.stages, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+import unittest
+import contextlib
+import io
+import tempfile
+import numpy as np
+import joblib
+import sys
+import os
+from unittest import mock
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from sklearn.model_selection import cross_val_score
+from sklearn.preprocessing import LabelEncoder
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.pipeline import LoanFeatureTransformer
+
+class TestPipelineExport(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a trained predictor"""
+        self.predictor = LoanPredictor()
+        self.df = self.predictor.create_sample_data(400)
+        self.applicants = self.df.drop(['Loan_Status'], axis=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.predictor.train_models(self.df)
+    
+    def test_to_pipeline_matches_predictor(self):
+        """Test that the exported pipeline scores exactly like predict_batch, also after a joblib round trip"""
+        expected = self.predictor.predict_batch(self.applicants)['probability'].values
+        pipeline = self.predictor.to_pipeline()
+        np.testing.assert_array_equal(pipeline.predict_proba(self.applicants)[:, 1], expected)
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pipeline.pkl')
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.predictor.save_pipeline(path)
+                loaded = LoanPredictor()
+                loaded.load_model(path)
+            np.testing.assert_array_equal(joblib.load(path).predict_proba(self.applicants)[:, 1], expected)
+            self.assertEqual(loaded.best_model_name, self.predictor.best_model_name)
+            np.testing.assert_array_equal(loaded.predict_batch(self.applicants)['probability'].values, expected)
+    
+    def test_pipeline_works_with_cross_val_score(self):
+        """Test that a candidate pipeline is a plain sklearn estimator"""
+        y = LabelEncoder().fit_transform(self.df['Loan_Status'])
+        scores = cross_val_score(self.predictor.make_pipeline('logistic'), self.applicants, y, cv=3)
+        self.assertEqual(len(scores), 3)
+        self.assertGreater(scores.mean(), 0.7)
+    
+    def test_selection_reuses_cached_features(self):
+        """Test that candidates share the features fitted on each fold through Pipeline memory"""
+        fit = LoanFeatureTransformer.fit
+        with mock.patch.object(LoanFeatureTransformer, 'fit', autospec=True, side_effect=fit) as spy:
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = self.predictor.select_model_pipeline(self.df, n_splits=3)
+        
+        # 3 cached fold fits plus the final refit, instead of 3 per candidate
+        self.assertEqual(spy.call_count, 3 + 1)
+        self.assertSetEqual(set(results), set(self.predictor.models))
+        best = max(results, key=lambda name: results[name]['mean_accuracy'])
+        self.assertEqual(self.predictor.best_model_name, best)
+        self.assertIn('approved', self.predictor.predict_loan(self.applicants.iloc[0].to_dict()))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import unittest
+import tempfile
+import json
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.portable import PORTABLE_MANIFEST, PortableModel
+
+class TestPortableExport(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        """Train one predictor per exportable model kind on the same data"""
+        base = LoanPredictor()
+        cls.df = base.create_sample_data(400)
+        cls.applicants = cls.df.drop(columns=['Loan_Status']).to_dict('records')
+        # Gaps are filled from the exported imputation values
+        cls.applicants[0]['LoanAmount'] = float('nan')
+        cls.applicants[1]['Gender'] = None
+        cls.predictors = {}
+        for name in ('logistic', 'random_forest', 'gradient_boosting', 'svm', 'svm_approx'):
+            predictor = LoanPredictor(kernel_approximation=100 if name == 'svm_approx' else None)
+            predictor.models = {name: predictor.models[name]}
+            predictor.train_models(cls.df)
+            cls.predictors[name] = predictor
+    
+    def export(self, predictor):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        predictor.export_portable(tmp.name)
+        return tmp.name
+    
+    def test_parity_with_sklearn(self):
+        """Test that the NumPy runtime reproduces predict_loan for every model kind"""
+        for name, predictor in self.predictors.items():
+            with self.subTest(model=name):
+                portable = PortableModel.load(self.export(predictor))
+                expected = predictor.predict_batch(self.applicants)
+                results = portable.predict_batch(self.applicants)
+                
+                np.testing.assert_allclose([r['probability'] for r in results], expected['probability'],
+                                           rtol=0, atol=1e-9)
+                self.assertEqual([r['approved'] for r in results], expected['approved'].tolist())
+                single, expected_single = portable.predict_loan(self.applicants[5]), predictor.predict_loan(self.applicants[5])
+                self.assertAlmostEqual(single.pop('probability'), expected_single.pop('probability'), places=12)
+                self.assertEqual(single, expected_single)
+    
+    def test_bundle_is_json_and_npy_only(self):
+        """Test that the export contains no pickles and loads memory-mapped"""
+        directory = self.export(self.predictors['logistic'])
+        with open(os.path.join(directory, PORTABLE_MANIFEST)) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['model_name'], 'logistic')
+        self.assertTrue(manifest['scaled'])
+        for filename in os.listdir(directory):
+            self.assertTrue(filename.endswith(('.json', '.npy')), filename)
+        
+        portable = PortableModel.load(directory, mmap_mode='r')
+        self.assertIsInstance(portable.arrays['coef'], np.memmap)
+        self.assertEqual(portable.predict_batch([]), [])
+    
+    def test_unrepresentable_applicants_raise(self):
+        """Test that unseen categories and unsupported models are rejected"""
+        portable = PortableModel.load(self.export(self.predictors['random_forest']))
+        with self.assertRaises(ValueError):
+            portable.predict_loan(dict(self.applicants[2], Property_Area='Downtown'))
+        
+        predictor = LoanPredictor()
+        with self.assertRaises(ValueError):
+            predictor.export_portable(tempfile.gettempdir())
+
+if __name__ == '__main__':
+    unittest.main()
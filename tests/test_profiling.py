@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import unittest
+import tempfile
+import tracemalloc
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.profiling import ProfileRecorder, SamplingProfiler, StageSpan
+
+class TestProfilingHooks(unittest.TestCase):
+    
+    def setUp(self):
+        self.predictor = LoanPredictor()
+        self.predictor.models = {name: self.predictor.models[name] for name in ('logistic', 'random_forest')}
+        self.df = self.predictor.create_sample_data(300)
+        self.recorder = ProfileRecorder(keep_events=True)
+        self.predictor.profiling_hooks.append(self.recorder)
+    
+    def test_training_and_prediction_stages(self):
+        """Test that every training and prediction stage reaches the hooks with its context"""
+        self.predictor.train_models(self.df)
+        self.predictor.predict_batch(self.df.drop(columns=['Loan_Status']).head(20))
+        
+        summary = self.recorder.summary()
+        for stage in ('preprocess_data', 'encode_features', 'split', 'scaling', 'fit[logistic]',
+                      'fit[random_forest]', 'evaluate[logistic]', 'evaluate[random_forest]', 'predict'):
+            self.assertIn(stage, summary)
+        self.assertEqual(summary['preprocess_data']['count'], 2)
+        self.assertAlmostEqual(summary['fit[random_forest]']['total_seconds'],
+                               self.predictor.fit_times['random_forest'])
+        predict = [event for event in self.recorder.events if event['stage'] == 'predict']
+        self.assertEqual(predict[0]['rows'], 20)
+        # Memory is only measured while tracemalloc is tracing
+        self.assertIsNone(predict[0]['memory_peak'])
+        self.assertIn('fit[logistic]', self.recorder.report())
+    
+    def test_memory_events_with_nested_stages(self):
+        """Test that an inner stage's peak is still counted in its parent's peak"""
+        events = []
+        tracemalloc.start()
+        try:
+            with StageSpan('outer', events.append):
+                with StageSpan('inner', events.append):
+                    block = bytearray(2_000_000)
+                    del block
+                kept = bytearray(500_000)
+        finally:
+            tracemalloc.stop()
+        
+        inner, outer = events
+        self.assertGreaterEqual(inner['memory_peak'], 2_000_000)
+        self.assertGreaterEqual(outer['memory_peak'], 2_000_000)
+        self.assertGreaterEqual(outer['memory_delta'], 500_000)
+        self.assertLess(outer['memory_delta'], 2_000_000)
+        del kept
+
+class TestSamplingProfiler(unittest.TestCase):
+    
+    def test_profile_requests_writes_collapsed_stacks(self):
+        """Test that the profiler samples only the requested number of predictions"""
+        predictor = LoanPredictor()
+        predictor.models = {'random_forest': predictor.models['random_forest']}
+        df = predictor.create_sample_data(300)
+        predictor.train_models(df)
+        applicants = df.drop(columns=['Loan_Status'])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'predict.folded')
+            profiler = predictor.profile_requests(path, n_requests=3, interval=0.0005)
+            for _ in range(3):
+                predictor.predict_batch(applicants)
+            self.assertTrue(profiler.finished)
+            self.assertEqual(profiler.requests, 3)
+            
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertGreater(len(lines), 0)
+            for line in lines:
+                stack, count = line.rsplit(' ', 1)
+                self.assertGreater(int(count), 0)
+            self.assertTrue(any('predict_batch' in line for line in lines))
+            
+            # Further predictions are not sampled and detach the finished profiler
+            predictor.predict_batch(applicants.head(5))
+            self.assertIsNone(predictor.profiler)
+            self.assertEqual(profiler.requests, 3)
+    
+    def test_stop_writes_partial_profile(self):
+        """Test that stop() writes the samples collected so far"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'partial.folded')
+            profiler = SamplingProfiler(path, n_requests=10)
+            with profiler.request():
+                sum(i * i for i in range(200000))
+            profiler.stop()
+            self.assertTrue(profiler.finished)
+            self.assertTrue(os.path.exists(path))
+            with self.assertRaises(ValueError):
+                SamplingProfiler(path, n_requests=0)
+
+if __name__ == '__main__':
+    unittest.main()
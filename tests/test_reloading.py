@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import unittest
+import tempfile
+import threading
+import time
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.reloading import ModelReloader, bundle_signature
+
+class TestModelReloader(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up a reloader whose 'models' are the contents of small text files"""
+        self.installed = []
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'model.txt')
+        self.reloader = ModelReloader(self.load, self.validate, self.installed.append)
+        self.addCleanup(self.reloader.stop)
+    
+    def load(self, path):
+        with open(path) as f:
+            return f.read()
+    
+    def validate(self, model):
+        if model == 'broken':
+            raise ValueError('smoke batch failed')
+    
+    def write(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+    
+    def test_failed_validation_keeps_current_model(self):
+        """Test that only models passing validation are swapped in"""
+        self.write('v1')
+        self.assertTrue(self.reloader.reload(self.path))
+        self.write('broken')
+        self.assertFalse(self.reloader.reload(self.path))
+        self.assertFalse(self.reloader.reload(os.path.join(self.tmp.name, 'missing.txt')))
+        
+        self.assertEqual(self.installed, ['v1'])
+        status = self.reloader.status()
+        self.assertEqual((status['state'], status['reloads'], status['failures']), ('failed', 1, 2))
+        self.assertIn('FileNotFoundError', status['last_error'])
+    
+    def test_background_reloads_do_not_overlap(self):
+        """Test that a reload requested while one is running is refused"""
+        self.write('v1')
+        release = threading.Event()
+        slow_load = self.reloader.load_fn
+        self.reloader.load_fn = lambda path: release.wait() and slow_load(path)
+        
+        self.assertTrue(self.reloader.reload_in_background(self.path))
+        time.sleep(0.05)
+        self.assertEqual(self.reloader.status()['state'], 'loading')
+        self.assertFalse(self.reloader.reload_in_background(self.path))
+        release.set()
+        with self.reloader._reload_lock:
+            self.assertEqual(self.installed, ['v1'])
+    
+    def test_watch_reloads_changed_bundle(self):
+        """Test that the watcher picks up a rewritten bundle exactly once"""
+        self.write('v1')
+        self.reloader.watch(self.path, interval=0.01)
+        time.sleep(0.05)
+        self.assertEqual(self.installed, [])
+        
+        self.write('v2 with a new size')
+        deadline = time.time() + 2
+        while not self.installed and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        self.assertEqual(self.installed, ['v2 with a new size'])
+        self.assertTrue(self.reloader.status()['watching'])
+    
+    def test_directory_signature_follows_manifest(self):
+        """Test that directory bundles are only seen once their manifest exists"""
+        directory = os.path.join(self.tmp.name, 'bundle')
+        os.makedirs(directory)
+        self.assertIsNone(bundle_signature(directory))
+        with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+            f.write('{}')
+        self.assertIsNotNone(bundle_signature(directory))
+        self.assertIsNone(bundle_signature(os.path.join(self.tmp.name, 'missing.pkl')))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
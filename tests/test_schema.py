@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.schema import APPLICANT_SCHEMA, compile_schema, format_errors
+
+APPLICANT = {
+    'gender': 'Male',
+    'married': 'Yes',
+    'dependents': '3+',
+    'education': 'Graduate',
+    'self_employed': 'No',
+    'applicant_income': 60000,
+    'coapplicant_income': '12000',
+    'loan_amount': 128000,
+    'loan_amount_term': 360,
+    'credit_history': '1.0',
+    'property_area': 'Urban'
+}
+
+class TestApplicantSchema(unittest.TestCase):
+    
+    def setUp(self):
+        self.schema = compile_schema(APPLICANT_SCHEMA)
+    
+    def test_converts_to_model_and_display_values(self):
+        """Test that one pass yields the model row in model units and the echoed values"""
+        applicant, display, errors = self.schema.convert(APPLICANT)
+        
+        self.assertEqual(errors, {})
+        self.assertEqual(applicant['ApplicantIncome'], 60000 / 12)
+        self.assertEqual(applicant['CoapplicantIncome'], 1000.0)
+        self.assertEqual(applicant['LoanAmount'], 128.0)
+        self.assertEqual(applicant['Dependents'], 3.0)
+        self.assertEqual(applicant['Credit_History'], 1.0)
+        self.assertEqual(applicant['Gender'], 'Male')
+        self.assertEqual(display['ApplicantIncome'], 60000.0)
+        self.assertEqual(display['Dependents'], '3+')
+        self.assertEqual(display['Credit_History'], 1.0)
+        self.assertEqual(list(applicant), [spec['column'] for spec in APPLICANT_SCHEMA.values()])
+    
+    def test_reports_all_errors_at_once(self):
+        """Test that every missing or invalid field is reported in a single result"""
+        payload = dict(APPLICANT, gender='male', loan_amount='lots', credit_history='good',
+                       applicant_income=float('nan'), dependents=True)
+        del payload['property_area']
+        _, _, errors = self.schema.convert(payload)
+        
+        self.assertEqual(set(errors), {'gender', 'loan_amount', 'credit_history', 'applicant_income',
+                                       'dependents', 'property_area'})
+        self.assertEqual(errors['property_area'], 'required')
+        message = format_errors(errors)
+        self.assertTrue(message.startswith("Missing required fields: ['property_area']"))
+        self.assertIn('loan_amount must be a number', message)
+    
+    def test_accepts_json_numbers_for_categories(self):
+        """Test that numeric dependents and credit history values are accepted"""
+        for dependents in (2, 2.0, '2', '2.0'):
+            applicant, display, errors = self.schema.convert(dict(APPLICANT, dependents=dependents, credit_history=0))
+            self.assertEqual(errors, {})
+            self.assertEqual(applicant['Dependents'], 2.0)
+            self.assertEqual(display['Dependents'], dependents)
+            self.assertEqual(applicant['Credit_History'], 0.0)
+    
+    def test_only_checks_what_the_model_needs(self):
+        """Test that numbers are not range-checked, as before the schema existed"""
+        payload = dict(APPLICANT, dependents='4', applicant_income=-100, loan_amount=0, credit_history=0.5)
+        applicant, _, errors = self.schema.convert(payload)
+        self.assertEqual(errors, {})
+        self.assertEqual(applicant['Dependents'], 4.0)
+        self.assertEqual(applicant['LoanAmount'], 0.0)
+        
+        # Stricter rules are available to schemas that opt in
+        strict = compile_schema({'term': {'column': 'Term', 'type': 'number', 'min': 1},
+                                 'history': {'column': 'History', 'type': 'number', 'allowed': [0, 1]}})
+        _, _, errors = strict.convert({'term': 0, 'history': 0.5})
+        self.assertEqual(errors, {'term': 'must be at least 1', 'history': 'must be one of [0.0, 1.0]'})
+    
+    def test_rejects_non_objects_and_unknown_types(self):
+        """Test that non-object payloads and unknown field types are rejected"""
+        _, _, errors = self.schema.convert([APPLICANT])
+        self.assertEqual(format_errors(errors), 'Expected a JSON object')
+        with self.assertRaises(ValueError):
+            compile_schema({'age': {'column': 'Age', 'type': 'date'}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import unittest
+import tempfile
+import pandas as pd
+import numpy as np
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.data_generation import write_sample_data
+from loan_predictor.scoring import main, score_file
+from loan_predictor.streaming import ChunkWriter
+
+class TestBulkScoring(unittest.TestCase):
+    
+    def setUp(self):
+        """Save a small trained model and an input file with an ID column"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.model_path = os.path.join(self.tmp.name, 'model.pkl')
+        self.source = os.path.join(self.tmp.name, 'applications.csv')
+        
+        predictor = LoanPredictor()
+        predictor.models = {'random_forest': predictor.models['random_forest']}
+        predictor.train_models(predictor.create_sample_data(300))
+        predictor.save_model(self.model_path)
+        self.predictor = predictor
+        
+        write_sample_data(self.source, 2500, chunk_size=1000)
+        df = pd.read_csv(self.source)
+        df.insert(0, 'Loan_ID', [f'LP{i:06d}' for i in range(len(df))])
+        df.to_csv(self.source, index=False)
+        self.expected = predictor.predict_batch(df)
+        self.ids = df['Loan_ID']
+    
+    def test_pool_matches_in_process_scoring(self):
+        """Test that pooled scoring writes every row in input order with the in-process results"""
+        progress = []
+        summary = score_file(self.model_path, self.source, os.path.join(self.tmp.name, 'pool.csv'),
+                             chunksize=300, workers=2, max_in_flight=2,
+                             progress=lambda rows, seconds: progress.append(rows))
+        score_file(self.model_path, self.source, os.path.join(self.tmp.name, 'single.csv'),
+                   chunksize=700, workers=1)
+        
+        pooled = pd.read_csv(os.path.join(self.tmp.name, 'pool.csv'))
+        single = pd.read_csv(os.path.join(self.tmp.name, 'single.csv'))
+        self.assertEqual(summary['rows'], 2500)
+        self.assertEqual(summary['chunks'], 9)
+        self.assertEqual(progress[-1], 2500)
+        self.assertEqual(list(pooled.columns), ['row', 'Loan_ID', 'approved', 'probability'])
+        np.testing.assert_array_equal(pooled['row'], np.arange(2500))
+        np.testing.assert_array_equal(pooled['Loan_ID'], self.ids)
+        np.testing.assert_allclose(pooled['probability'], self.expected['probability'])
+        np.testing.assert_array_equal(pooled['approved'], self.expected['approved'])
+        pd.testing.assert_frame_equal(pooled, single)
+    
+    def test_cli_writes_jsonl(self):
+        """Test that the command line entry point scores into a JSON-lines file"""
+        output = os.path.join(self.tmp.name, 'scores.jsonl')
+        summary = main([self.source, output, '--model', self.model_path, '--workers', '1',
+                        '--chunk-size', '1000', '--keep', ''])
+        
+        scores = pd.read_json(output, lines=True)
+        self.assertEqual(summary['rows'], 2500)
+        self.assertEqual(list(scores.columns), ['row', 'approved', 'probability'])
+        with self.assertRaises(ValueError):
+            ChunkWriter(os.path.join(self.tmp.name, 'scores.xlsx'))
+
+if __name__ == '__main__':
+    unittest.main()
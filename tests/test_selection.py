@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.selection import cross_validate_models
+
+class TestCrossValidatedSelection(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        predictor = LoanPredictor()
+        data = predictor.create_sample_data(200)
+        df = predictor.encode_features(predictor.preprocess_data(data), fit=True)
+        cls.X = df.drop(['Loan_Status'], axis=1)
+        cls.y = (df['Loan_Status'] == 'Y').astype(int).values
+        cls.models = predictor.models
+        cls.data = data
+    
+    def test_full_evaluation_without_pruning(self):
+        """Test that every candidate is scored on every fold when pruning is off"""
+        results = cross_validate_models(self.models, self.X, self.y, ['logistic', 'svm'],
+                                        n_splits=4, prune=False)
+        
+        self.assertEqual(list(results), list(self.models))
+        for result in results.values():
+            self.assertEqual(len(result['scores']), 4)
+            self.assertFalse(result['pruned'])
+            self.assertTrue(0 <= result['mean_accuracy'] <= 1)
+    
+    def test_pruning_matches_across_parallel_runs(self):
+        """Test that successive halving drops losers early and is independent of n_jobs"""
+        sequential = cross_validate_models(self.models, self.X, self.y, ['logistic', 'svm'],
+                                           n_splits=4, min_folds=1, eta=2)
+        parallel = cross_validate_models(self.models, self.X, self.y, ['logistic', 'svm'],
+                                         n_splits=4, min_folds=1, eta=2, n_jobs=2)
+        
+        pruned = [name for name, result in sequential.items() if result['pruned']]
+        self.assertEqual(len(pruned), 3)
+        for name in pruned:
+            self.assertLess(len(sequential[name]['scores']), 4)
+        for name in self.models:
+            self.assertEqual(list(parallel[name]['scores']), list(sequential[name]['scores']))
+    
+    def test_select_model_cv_sets_best_model(self):
+        """Test that the selected model is refitted and usable for predictions"""
+        predictor = LoanPredictor()
+        results = predictor.select_model_cv(self.data, n_splits=3)
+        
+        best_name = predictor.best_model[0]
+        self.assertFalse(results[best_name]['pruned'])
+        survivors = [r['mean_accuracy'] for r in results.values() if not r['pruned']]
+        self.assertEqual(results[best_name]['mean_accuracy'], max(survivors))
+        
+        applicant = self.data.drop(['Loan_Status'], axis=1).iloc[0].to_dict()
+        result = predictor.predict_loan(applicant)
+        self.assertEqual(result['model_used'], best_name)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
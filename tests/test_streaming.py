@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import unittest
+import numpy as np
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.streaming import Reservoir, iter_chunks
+
+class TestStreamingTraining(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.data = LoanPredictor().create_sample_data(1000)
+        cls.data.loc[::7, 'LoanAmount'] = np.nan
+        cls.data.loc[::11, 'Gender'] = None
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, 'applications.csv')
+        cls.data.to_csv(cls.path, index=False)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+    
+    def test_chunked_statistics_match_in_memory_fit(self):
+        """Test that streamed imputation values and encoders equal those fitted on the full frame"""
+        streamed = LoanPredictor()
+        results = streamed.train_streaming(self.path, chunksize=150, n_epochs=2)
+        
+        in_memory = LoanPredictor()
+        in_memory.train_models(self.data)
+        
+        self.assertEqual(streamed.imputation_values, in_memory.imputation_values)
+        self.assertEqual(streamed.feature_columns, in_memory.feature_columns)
+        for col, encoder in in_memory.label_encoders.items():
+            self.assertListEqual(list(streamed.label_encoders[col].classes_), list(encoder.classes_))
+        
+        self.assertIn(streamed.best_model[0], results)
+        self.assertGreater(max(results.values()), 0.7)
+        predictions = streamed.predict_batch(self.data.drop(['Loan_Status'], axis=1).head(20))
+        self.assertEqual(len(predictions), 20)
+    
+    def test_callable_source_and_chunk_sizes(self):
+        """Test that sources are re-read per pass in chunks of the requested size"""
+        chunks = list(iter_chunks(self.path, chunksize=300))
+        self.assertEqual([len(chunk) for chunk in chunks], [300, 300, 300, 100])
+        
+        frames = lambda: iter([self.data.iloc[:500], self.data.iloc[500:]])
+        self.assertEqual(sum(len(chunk) for chunk in iter_chunks(frames)), 1000)
+        self.assertEqual(sum(len(chunk) for chunk in iter_chunks(frames)), 1000)
+        
+        with self.assertRaises(ValueError):
+            list(iter_chunks('applications.xlsx'))
+    
+    def test_reservoir_median(self):
+        """Test that the reservoir median is exact when small and close when sampled"""
+        values = np.random.default_rng(0).normal(100, 10, 50000)
+        
+        exact = Reservoir(size=100000)
+        sampled = Reservoir(size=5000)
+        for chunk in np.array_split(values, 10):
+            exact.update(chunk)
+            sampled.update(chunk)
+        
+        self.assertEqual(exact.median(), np.median(values))
+        self.assertAlmostEqual(sampled.median(), np.median(values), delta=1.0)
+        self.assertEqual(sampled.seen, 50000)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+import unittest
+import numpy as np
+import pandas as pd
+import sys
+import os
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from loan_predictor.loan_predictor import LoanPredictor
+from loan_predictor.tree_compiler import CompiledTreeEnsemble
+
+class TestTreeCompiler(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.predictor = LoanPredictor()
+        cls.data = cls.predictor.create_sample_data(300)
+        cls.predictor.train_models(cls.data)
+        cls.applicants = cls.data.drop(['Loan_Status'], axis=1)
+        cls.X = cls.predictor._prepare_features(cls.applicants)
+    
+    def test_probabilities_match_sklearn(self):
+        """Test that compiled forests and boosting models reproduce predict_proba"""
+        for name in ['random_forest', 'gradient_boosting']:
+            model = self.predictor.models[name]
+            compiled = CompiledTreeEnsemble.from_estimator(model)
+            
+            np.testing.assert_allclose(compiled.predict_proba(self.X), model.predict_proba(self.X),
+                                       rtol=0, atol=1e-12)
+            np.testing.assert_array_equal(compiled.predict(self.X), model.predict(self.X))
+    
+    def test_saved_arrays_round_trip(self):
+        """Test that node arrays saved as .npy load back memory-mapped with identical output"""
+        compiled = CompiledTreeEnsemble.from_estimator(self.predictor.models['random_forest'])
+        with tempfile.TemporaryDirectory() as tmp:
+            compiled.save(tmp)
+            loaded = CompiledTreeEnsemble.load(tmp, mmap_mode='r')
+            self.assertIsInstance(loaded.threshold, np.memmap)
+            np.testing.assert_array_equal(loaded.predict_proba(self.X), compiled.predict_proba(self.X))
+    
+    def test_predictor_uses_compiled_trees(self):
+        """Test that predict_loan and predict_batch plug in the compiled ensemble transparently"""
+        original = self.predictor.best_model
+        try:
+            for name in ['random_forest', 'gradient_boosting']:
+                self.predictor.best_model = (name, self.predictor.models[name])
+                self.predictor.compiled_inference = None
+                self.predictor.compiled_trees = None
+                expected = self.predictor.predict_batch(self.applicants.head(20))
+                
+                self.predictor.compile_inference()
+                self.assertIsNotNone(self.predictor.compiled_trees)
+                actual = self.predictor.predict_batch(self.applicants.head(20))
+                pd.testing.assert_series_equal(actual['approved'], expected['approved'])
+                np.testing.assert_allclose(actual['probability'], expected['probability'], atol=1e-12)
+                
+                single = self.predictor.predict_loan(self.applicants.iloc[0].to_dict())
+                self.assertAlmostEqual(single['probability'], expected['probability'].iloc[0], places=12)
+        finally:
+            self.predictor.best_model = original
+            self.predictor.compiled_inference = None
+            self.predictor.compiled_trees = None
+    
+    def test_directory_bundle_serves_without_estimator(self):
+        """Test that a directory bundle scores through its compiled trees without loading the estimator"""
+        predictor = LoanPredictor()
+        predictor.best_model = ('random_forest', self.predictor.models['random_forest'])
+        for attr in ['label_encoders', 'scaler', 'feature_columns', 'imputation_values']:
+            setattr(predictor, attr, getattr(self.predictor, attr))
+        expected = predictor.predict_batch(self.applicants.head(20))
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            predictor.save_model(tmp, mmap=True)
+            loaded = LoanPredictor()
+            loaded.load_model(tmp)
+            loaded.compile_inference()
+            
+            actual = loaded.predict_batch(self.applicants.head(20))
+            pd.testing.assert_frame_equal(actual, expected)
+            self.assertIsNone(loaded._best_model)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
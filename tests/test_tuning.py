@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+import unittest
+import contextlib
+import io
+import tempfile
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '../src'))
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from loan_predictor.loan_predictor import LoanPredictor, approximate_svm
+from loan_predictor.tuning import SEARCH_SPACES, sample_candidates, search_hyperparameters
+
+class TestHyperparameterSearch(unittest.TestCase):
+    
+    def setUp(self):
+        """Set up encoded sample data and two cheap models"""
+        predictor = LoanPredictor()
+        X = predictor.transform(predictor.create_sample_data(300))
+        self.y = (X.pop('Loan_Status') == 'Y').astype(int).values
+        self.X = X
+        self.models = {
+            'logistic': LogisticRegression(random_state=42),
+            'tree': DecisionTreeClassifier(random_state=42)
+        }
+        self.spaces = {
+            'logistic': {'C': [0.01, 0.1, 1.0, 10.0]},
+            'tree': {'max_depth': [2, 3, 4, 6, 8]}
+        }
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+    
+    def search(self, spaces, **kwargs):
+        return search_hyperparameters(self.models, self.X, self.y, scaled_models=['logistic'],
+                                      search_spaces=spaces, n_iter=10, n_splits=4, min_folds=1, eta=2,
+                                      cache_dir=self.cache_dir.name, **kwargs)
+    
+    def test_sample_candidates(self):
+        """Test that small grids are enumerated and large spaces sampled without repeats"""
+        self.assertEqual(len(sample_candidates({'a': [1, 2], 'b': [3, 4]}, 10)), 4)
+        sampled = sample_candidates({'a': list(range(10)), 'b': list(range(10))}, 5)
+        self.assertEqual(len({tuple(sorted(p.items())) for p in sampled}), 5)
+        self.assertEqual(sampled, sample_candidates({'a': list(range(10)), 'b': list(range(10))}, 5))
+    
+    def test_kernel_approximation_space(self):
+        """Test that the svm_approx space tunes the nested Nystroem and linear SVM parameters"""
+        results = search_hyperparameters({'svm_approx': approximate_svm(50)}, self.X, self.y, ['svm_approx'],
+                                         search_spaces=SEARCH_SPACES, n_iter=2, strategy='random', n_splits=3,
+                                         cache_dir=None)
+        for candidate in results['svm_approx']['candidates']:
+            approximate_svm().set_params(**candidate['params'])
+        self.assertEqual(len(results['svm_approx']['candidates']), 3)
+    
+    def test_halving_prunes_and_keeps_the_starting_point(self):
+        """Test that successive halving gives losing configurations fewer folds"""
+        results = self.search(self.spaces)
+        
+        for name, result in results.items():
+            self.assertEqual(result['candidates'][0]['params'], {})
+            folds = [candidate['folds'] for candidate in result['candidates']]
+            self.assertEqual(max(folds), 4)
+            self.assertEqual(min(folds), 1)
+            best = max((c for c in result['candidates'] if c['folds'] == 4), key=lambda c: c['mean_accuracy'])
+            self.assertAlmostEqual(result['best_score'], best['mean_accuracy'])
+        
+        exhaustive = self.search(self.spaces, strategy='random')
+        self.assertTrue(all(c['folds'] == 4 for c in exhaustive['tree']['candidates']))
+        with self.assertRaises(ValueError):
+            self.search(self.spaces, strategy='grid')
+    
+    def test_cache_resumes_and_extends(self):
+        """Test that reruns, crashes and widened spaces only fit what has not been scored"""
+        first = self.search(self.spaces)
+        self.assertEqual(first['tree']['cached'], 0)
+        
+        rerun = self.search(self.spaces)
+        self.assertEqual(sum(r['evaluated'] for r in rerun.values()), 0)
+        self.assertEqual(rerun['tree']['best_params'], first['tree']['best_params'])
+        
+        # A crash mid-search leaves some records missing and at worst one unreadable
+        records = sorted(os.listdir(self.cache_dir.name))
+        os.remove(os.path.join(self.cache_dir.name, records[0]))
+        with open(os.path.join(self.cache_dir.name, records[1]), 'w') as f:
+            f.write('{"accur')
+        resumed = self.search(self.spaces)
+        self.assertEqual(sum(r['evaluated'] for r in resumed.values()), 2)
+        
+        widened = dict(self.spaces, tree={'max_depth': [2, 3, 4, 6, 8, 12]})
+        extended = self.search(widened)
+        self.assertGreater(extended['tree']['cached'], 0)
+        self.assertGreater(extended['tree']['evaluated'], 0)
+        self.assertEqual(extended['logistic']['evaluated'], 0)
+    
+    def test_tuned_configs_flow_into_models(self):
+        """Test that tune_models stores the winning configuration in self.models"""
+        predictor = LoanPredictor()
+        predictor.models = {'logistic': LogisticRegression(random_state=42)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = predictor.tune_models(predictor.create_sample_data(300), n_splits=3,
+                                            cache_dir=self.cache_dir.name,
+                                            search_spaces={'logistic': {'C': [0.001, 100.0]}})
+            predictor.train_models(predictor.create_sample_data(300))
+        
+        self.assertEqual(predictor.tuning_results, results)
+        expected_c = results['logistic']['best_params'].get('C', 1.0)
+        self.assertEqual(predictor.models['logistic'].C, expected_c)
+        self.assertEqual(predictor.best_model_name, 'logistic')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)